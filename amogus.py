@@ -4,6 +4,11 @@ import pygame
 import math
 import random
 import time  # <--- AM IMPORTAT TIME
+import resources
+import inference
+import frame_presenter
+import sprites
+import text_cache
 
 # --- CONFIGURĂRI ---
 WIDTH, HEIGHT = 800, 600
@@ -17,6 +22,10 @@ COLORS = {
     'pink': (255, 0, 255)
 }
 COLOR_KEYS = list(COLORS.keys())
+COPPER = (184, 115, 51)
+
+# Conectorii (cutie + contur + simbol) nu se schimba: cate un sprite pe culoare
+connector_sprites = {}
 
 
 # --- FUNCȚIE GRAFICĂ SIMBOLURI ---
@@ -38,6 +47,20 @@ def draw_symbol(surface, color_name, rect):
         pygame.draw.rect(surface, (0, 0, 0), rect_s, 2)
 
 
+def connector_sprite(color_name):
+    sprite = connector_sprites.get(color_name)
+    if sprite is None:
+        def draw(surface, center):
+            rect = pygame.Rect(0, 0, 40, 40)
+            rect.center = center
+            pygame.draw.rect(surface, (100, 100, 100), rect)
+            pygame.draw.rect(surface, COLORS[color_name], rect, 5)
+            draw_symbol(surface, color_name, rect)
+
+        sprite = connector_sprites[color_name] = sprites.Sprite(draw, 24)
+    return sprite
+
+
 # --- CLASA CABLU ---
 class Wire:
     def __init__(self, color_name, y_pos, is_left):
@@ -89,13 +112,11 @@ class Wire:
                 self.dragging = False
 
     def draw(self, surface):
-        pygame.draw.rect(surface, (100, 100, 100), self.rect)
-        pygame.draw.rect(surface, self.color, self.rect, 5)
-        draw_symbol(surface, self.color_name, self.rect)
+        connector_sprite(self.color_name).blit(surface, self.rect.center)
 
         if self.is_left:
             pygame.draw.line(surface, self.color, self.start_pos, self.end_pos, 15)
-            pygame.draw.circle(surface, (184, 115, 51), self.end_pos, 10)
+            sprites.dot(COPPER, 10).blit(surface, self.end_pos)
 
 
 # --- GENERARE NIVEL ---
@@ -133,123 +154,131 @@ def start_game():
 
     # Inițializare MediaPipe
     mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
-
-    cap = cv2.VideoCapture(0)
-    cap.set(3, CAP_WIDTH)
-    cap.set(4, CAP_HEIGHT)
-
-    # Asiguram lumina buna
-    cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 3)
-    cap.set(cv2.CAP_PROP_EXPOSURE, 0)
-
-    left_wires, right_wires = create_level()
-
-    # --- DELAY DE 0.5 SECUNDE LA START ---
-    # Acest lucru ajuta la tranzitia vizuala intre jocuri
-    time.sleep(0.5)
-
-    # --- BUCLA PRINCIPALĂ ---
-    run = True
-    while run:
-        # 1. Event Handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r:  # Resetare nivel
-                    left_wires, right_wires = create_level()
-                if event.key == pygame.K_ESCAPE:  # Ieșire și pe tasta ESC
+    # Aceeasi configuratie ca in automatica, deci graful e refolosit intre jocuri
+    hands = resources.get_model("hands", lambda: mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7))
+    # Hands ruleaza pe thread separat; bucla de randare foloseste ultimul rezultat publicat.
+    # In modul video graful urmareste singur mana si sare peste detectia palmei cat o vede
+    hands_worker = inference.InferenceWorker(hands.process, name="HandsWorker")
+    last_frame_seq = 0
+
+    # Curatenia ruleaza si daca jocul cade cu exceptie (altfel workerul si fereastra raman deschise)
+    try:
+        cap = resources.get_camera()
+        # Camera pe fundal, transparenta 150/255 peste gri (30, 30, 30); amestecul se face in buffer,
+        # deci blit-ul ramane opac
+        presenter = frame_presenter.FramePresenter((WIDTH, HEIGHT), "BGR", alpha=150, background=30)
+        cap.set(3, CAP_WIDTH)
+        cap.set(4, CAP_HEIGHT)
+
+        # Asiguram lumina buna (doar pentru amogus; release_camera() reface expunerea)
+        resources.set_camera_property(cv2.CAP_PROP_AUTO_EXPOSURE, 3)
+        resources.set_camera_property(cv2.CAP_PROP_EXPOSURE, 0)
+
+        left_wires, right_wires = create_level()
+
+        # --- DELAY DE 0.5 SECUNDE LA START ---
+        # Acest lucru ajuta la tranzitia vizuala intre jocuri
+        time.sleep(0.5)
+
+        # --- BUCLA PRINCIPALĂ ---
+        run = True
+        while run:
+            # 1. Event Handling
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     run = False
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_r:  # Resetare nivel
+                        left_wires, right_wires = create_level()
+                    if event.key == pygame.K_ESCAPE:  # Ieșire și pe tasta ESC
+                        run = False
+
+            # 2. Webcam & MediaPipe
+            camera_img, frame_seq, frame_ts = cap.latest()
+            if camera_img is None: continue
+
+            # Doar frame-urile noi se oglindesc, se trimit la model si se scriu in fundal; intre ele
+            # refolosim fundalul din presenter si nu asteptam niciodata modelul
+            if frame_seq != last_frame_seq:
+                img = cv2.flip(camera_img, 1)
+                img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                hands_worker.submit(img_rgb, frame_ts)
+                background = presenter.present(img)
+                last_frame_seq = frame_seq
+            results = hands_worker.latest().result
+
+            cursor_pos = (0, 0)
+            is_pinching = False
+
+            if results and results.multi_hand_landmarks:
+                for hand_lms in results.multi_hand_landmarks:
+                    x_index = int(hand_lms.landmark[8].x * WIDTH)
+                    y_index = int(hand_lms.landmark[8].y * HEIGHT)
+                    x_thumb = int(hand_lms.landmark[4].x * WIDTH)
+                    y_thumb = int(hand_lms.landmark[4].y * HEIGHT)
+
+                    # Cursorul este media dintre degetul mare și arătător
+                    cursor_pos = ((x_index + x_thumb) // 2, (y_index + y_thumb) // 2)
+                    distance = math.hypot(x_index - x_thumb, y_index - y_thumb)
+
+                    if distance < PINCH_THRESHOLD:
+                        is_pinching = True
+
+            # --- 3. LOGICĂ SUPLIMENTARĂ (EXIT) ---
+
+            # Verificăm dacă cursorul este peste butonul de EXIT
+            is_hovering_exit = EXIT_BUTTON_RECT.collidepoint(cursor_pos)
+
+            # Dacă suntem peste buton și facem PINCH -> Ieșim
+            if is_hovering_exit and is_pinching:
+                run = False
 
-        # 2. Webcam & MediaPipe
-        success, img = cap.read()
-        if not success: continue
-
-        img = cv2.flip(img, 1)
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        results = hands.process(img_rgb)
-
-        cursor_pos = (0, 0)
-        is_pinching = False
-
-        if results.multi_hand_landmarks:
-            for hand_lms in results.multi_hand_landmarks:
-                h, w, c = img.shape
-                x_index = int(hand_lms.landmark[8].x * WIDTH)
-                y_index = int(hand_lms.landmark[8].y * HEIGHT)
-                x_thumb = int(hand_lms.landmark[4].x * WIDTH)
-                y_thumb = int(hand_lms.landmark[4].y * HEIGHT)
-
-                # Cursorul este media dintre degetul mare și arătător
-                cursor_pos = ((x_index + x_thumb) // 2, (y_index + y_thumb) // 2)
-                distance = math.hypot(x_index - x_thumb, y_index - y_thumb)
-
-                if distance < PINCH_THRESHOLD:
-                    is_pinching = True
-
-        # --- 3. LOGICĂ SUPLIMENTARĂ (EXIT) ---
-
-        # Verificăm dacă cursorul este peste butonul de EXIT
-        is_hovering_exit = EXIT_BUTTON_RECT.collidepoint(cursor_pos)
-
-        # Dacă suntem peste buton și facem PINCH -> Ieșim
-        if is_hovering_exit and is_pinching:
-            run = False
-
-        # --- 4. DESENARE ---
-        # Convertim imaginea OpenCV pentru Pygame
-        try:
-            img_surface = pygame.image.frombuffer(img.tobytes(), img.shape[1::-1], "BGR")
-        except AttributeError:
-            # Fallback pentru versiuni mai vechi de numpy/cv2
-            img_surface = pygame.image.frombuffer(img.tostring(), img.shape[1::-1], "BGR")
-
-        img_surface = pygame.transform.scale(img_surface, (WIDTH, HEIGHT))
-        img_surface.set_alpha(150)  # Transparență pentru a vedea jocul clar
-
-        screen.fill((30, 30, 30))
-        screen.blit(img_surface, (0, 0))
-
-        # Desenare Buton EXIT
-        current_btn_color = EXIT_COLOR_HOVER if is_hovering_exit else EXIT_COLOR_NORMAL
-        pygame.draw.rect(screen, current_btn_color, EXIT_BUTTON_RECT, border_radius=10)
-        pygame.draw.rect(screen, (255, 255, 255), EXIT_BUTTON_RECT, 2, border_radius=10)  # Contur alb
-
-        # Text Buton
-        text_surf = font_btn.render("EXIT", True, (255, 255, 255))
-        text_rect = text_surf.get_rect(center=EXIT_BUTTON_RECT.center)
-        screen.blit(text_surf, text_rect)
-
-        # Desenare Cabluri (întâi cele din dreapta - țintele)
-        for wire in right_wires:
-            wire.draw(screen)
-
-        # Verificăm dacă tragem vreun cablu
-        dragging_any = any(w.dragging for w in left_wires)
-
-        # Desenăm cablurile din stânga
-        for wire in left_wires:
-            # Actualizăm doar dacă nu tragem altceva SAU dacă acesta e cel tras
-            if not dragging_any or wire.dragging:
-                wire.update(cursor_pos, is_pinching, right_wires)
-            wire.draw(screen)
-
-        # Cursor
-        cursor_color = (0, 255, 0) if is_pinching else (255, 0, 0)
-        pygame.draw.circle(screen, cursor_color, cursor_pos, 10)
-        pygame.draw.circle(screen, (255, 255, 255), cursor_pos, 12, 2)
-
-        # Mesaj Victorie
-        if all(w.connected for w in left_wires):
-            text = font_win.render("GOOD JOB!", True, (0, 255, 0))
-            screen.blit(text, (WIDTH // 2 - 100, HEIGHT // 2))
-
-        pygame.display.flip()
-        clock.tick(60)
-
-    cap.release()
-    # pygame.quit() # Lasam asta comentat, gestionam inchiderea din fisierul principal
+            # --- 4. DESENARE ---
+            # Imaginea OpenCV e deja in Surface-ul presenter-ului (acopera tot ecranul)
+            screen.blit(background, (0, 0))
+
+            # Desenare Buton EXIT
+            current_btn_color = EXIT_COLOR_HOVER if is_hovering_exit else EXIT_COLOR_NORMAL
+            pygame.draw.rect(screen, current_btn_color, EXIT_BUTTON_RECT, border_radius=10)
+            pygame.draw.rect(screen, (255, 255, 255), EXIT_BUTTON_RECT, 2, border_radius=10)  # Contur alb
+
+            # Text Buton
+            text_surf = text_cache.render(font_btn, "EXIT", (255, 255, 255))
+            text_rect = text_surf.get_rect(center=EXIT_BUTTON_RECT.center)
+            screen.blit(text_surf, text_rect)
+
+            # Desenare Cabluri (întâi cele din dreapta - țintele)
+            for wire in right_wires:
+                wire.draw(screen)
+
+            # Verificăm dacă tragem vreun cablu
+            dragging_any = any(w.dragging for w in left_wires)
+
+            # Desenăm cablurile din stânga
+            for wire in left_wires:
+                # Actualizăm doar dacă nu tragem altceva SAU dacă acesta e cel tras
+                if not dragging_any or wire.dragging:
+                    wire.update(cursor_pos, is_pinching, right_wires)
+                wire.draw(screen)
+
+            # Cursor
+            cursor_color = (0, 255, 0) if is_pinching else (255, 0, 0)
+            pygame.draw.circle(screen, cursor_color, cursor_pos, 10)
+            pygame.draw.circle(screen, (255, 255, 255), cursor_pos, 12, 2)
+
+            # Mesaj Victorie
+            if all(w.connected for w in left_wires):
+                text = text_cache.render(font_win, "GOOD JOB!", (0, 255, 0))
+                screen.blit(text, (WIDTH // 2 - 100, HEIGHT // 2))
+
+            pygame.display.flip()
+            clock.tick(60)
+    finally:
+        hands_worker.stop()
+        resources.release_model("hands")
+        resources.release_camera()
+        # Inchidem doar fereastra; pygame.quit() il face cine ne-a pornit (sau programul la iesire)
+        pygame.display.quit()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+from PIL import Image
+
+"""
+Cache pe disc pentru imaginile launcher-ului (harta.py), deja redimensionate si decupate.
+
+Intrarile sunt salvate ca PPM (pixeli RGB necomprimati), deci la pornire nu mai decodam
+JPEG-urile mari si nu mai facem resize LANCZOS. Cheia contine calea sursei, mtime, marimea
+fisierului si geometria tinta: daca o imagine se schimba, intrarea ei se reface singura,
+iar intrarile vechi pentru aceeasi sursa sunt sterse.
+
+IMPLEMENTARE:
+    img = asset_cache.load_resized("images/harta.jpg", (920, 552), (0, 0, 800, 480))
+"""
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "assets")
+
+
+def _entry_path(source_path, scaled_size, crop_box):
+    source_path = os.path.abspath(source_path)
+    st = os.stat(source_path)
+    source_id = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:16]
+    key = f"{st.st_mtime_ns}|{st.st_size}|{scaled_size}|{crop_box}"
+    key_id = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return source_id, os.path.join(CACHE_DIR, f"{source_id}-{key_id}.ppm")
+
+
+def _remove_stale(source_id, keep_path):
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if name.startswith(source_id + "-") and path != keep_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_resized(source_path, scaled_size, crop_box):
+    """Imaginea sursa redimensionata la scaled_size si decupata la crop_box (din cache daca exista)."""
+    source_id, cached = _entry_path(source_path, scaled_size, crop_box)
+
+    if os.path.exists(cached):
+        try:
+            img = Image.open(cached)
+            img.load()
+            return img
+        except OSError:
+            pass  # Intrare corupta, o refacem mai jos
+
+    img = Image.open(source_path).convert("RGB")
+    img = img.resize(scaled_size, Image.Resampling.LANCZOS)
+    img = img.crop(crop_box)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = cached + ".tmp"
+        img.save(tmp_path, format="PPM")
+        os.replace(tmp_path, cached)
+        _remove_stale(source_id, cached)
+    except OSError as e:
+        print(f"Cache-ul pentru {source_path} nu a putut fi scris: {e}")
+
+    return img
@@ -0,0 +1,95 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+import camera
+
+"""
+Profiling pentru pipeline-urile video ale jocurilor, fara camera si fara fereastra.
+
+Frame-urile vin dintr-o sursa inregistrata (fisier video sau director cu imagini), redata
+cat de repede se poate, deci numerele sunt repetabile de la o rulare la alta.
+
+EXEMPLE:
+    python benchmark.py electronica inregistrari/lanterna.mp4
+    python benchmark.py calculatoare_joc inregistrari/pose_frames/ --frames 300
+"""
+
+
+def bench_electronica():
+    import electronica
+    import light_tracking
+    tracker = light_tracking.BlobTracker(search_radius=electronica.SEARCH_RADIUS)
+    # Tier-ul din QUALITY_TIER (fara guvernator, ca numerele sa fie comparabile)
+    tier = electronica.QUALITY_TIERS[electronica.quality_tier_index(electronica.QUALITY_TIER)]
+
+    def process(frame):
+        frame = cv2.flip(frame, 1)
+        blob = electronica.detect_light(frame, tracker, tier)
+        if blob and electronica.DETECTION_REFINE and tier["detection_scale"] != 1.0:
+            electronica.refine_blob(frame, blob)
+
+    return process
+
+
+def bench_calculatoare_joc():
+    import calculatoare_joc
+    pose = calculatoare_joc.create_pose()
+
+    def process(frame):
+        frame = cv2.flip(frame, 1)
+        frame = cv2.resize(frame, calculatoare_joc.WINDOW_SIZE)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        pose.process(frame_rgb)
+
+    return process
+
+
+PIPELINES = {
+    "electronica": bench_electronica,
+    "calculatoare_joc": bench_calculatoare_joc,
+}
+
+
+def run(pipeline_name, source_spec, max_frames=None, warmup=5):
+    process = PIPELINES[pipeline_name]()
+    source = camera.open_source(source_spec, fps=0)
+
+    timings = []
+    frames = 0
+    try:
+        while max_frames is None or frames < max_frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            t0 = time.perf_counter()
+            process(frame)
+            dt = time.perf_counter() - t0
+            frames += 1
+            if frames > warmup:
+                timings.append(dt)
+    finally:
+        source.release()
+
+    if not timings:
+        print("Prea putine frame-uri in sursa.")
+        return None
+
+    ms = np.array(timings) * 1000.0
+    print(f"{pipeline_name}: {len(ms)} frame-uri (dupa {warmup} de warmup)")
+    print(f"  medie {ms.mean():.2f} ms | mediana {np.median(ms):.2f} ms | p95 {np.percentile(ms, 95):.2f} ms")
+    print(f"  ~{1000.0 / ms.mean():.1f} FPS")
+    return ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profiling offline pentru pipeline-urile video.")
+    parser.add_argument("pipeline", choices=sorted(PIPELINES))
+    parser.add_argument("source", help="fisier video, director cu imagini sau index de camera")
+    parser.add_argument("--frames", type=int, default=None, help="numar maxim de frame-uri")
+    parser.add_argument("--warmup", type=int, default=5, help="frame-uri ignorate la inceput")
+    args = parser.parse_args()
+
+    run(args.pipeline, args.source, args.frames, args.warmup)
@@ -4,15 +4,32 @@ import numpy as np
 import pygame
 import random
 import math
+import time
 import os
 import csv
 import leaderboard
+import particle_pool
+import resources
+import inference
+import prediction
+import frame_presenter
+import game_clock
+import sprites
+import text_cache
 
 # --- CONFIGURARE ---
 WINDOW_SIZE = (800, 480)
 # NOU: Folosim calea către fișierul CSV al clasamentului
 LEADERBOARD_GAME_FILE = "calculatoare_joc.csv"
 SMOOTHING_FACTOR = 0.3  # 0.1 = Foarte lent/smooth, 0.9 = Foarte rapid/tremurat (0.3 e ideal)
+# "predict" = filtru One-Euro + extrapolare la momentul randarii (ascunde latenta modelului)
+# "lerp" = vechiul smoothing spre ultima tinta bruta (SMOOTHING_FACTOR)
+SMOOTHING_MODE = os.environ.get("SMOOTHING_MODE", "predict")
+BACKGROUND_DIM = 0.3  # luminozitatea camerei pe fundal (0 = negru, 1 = normal)
+# Simularea (cadere, spawn, combo, shake) merge mereu cu SIM_HZ pasi pe secunda;
+# randarea poate fi mai rara pe hardware slab fara sa se schimbe viteza jocului
+SIM_HZ = 30
+RENDER_FPS = int(os.environ.get("RENDER_FPS", "30"))
 
 # Culori Neon
 COLOR_SKELETON = (0, 255, 255)
@@ -26,7 +43,11 @@ COLOR_INPUT_BG = (50, 50, 50)
 
 # --- INITIALIZARE MEDIAPIPE ---
 mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5, model_complexity=0)
+
+
+def create_pose():
+    """Graful Pose se construieste abia cand porneste jocul, nu la import."""
+    return mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5, model_complexity=0)
 
 
 # --- FUNCTIE DE SMOOTHING (LERP) ---
@@ -47,89 +68,189 @@ def lerp_point(p1, p2, alpha):
 
 
 # --- CLASE JOC ---
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vx = random.uniform(-5, 5)
-        self.vy = random.uniform(-5, 5)
-        self.life = random.randint(15, 30)
-        self.size = random.randint(2, 6)
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
-
-    def draw(self, surface, offset_x=0, offset_y=0):
-        if self.life > 0:
-            pygame.draw.circle(surface, self.color, (int(self.x + offset_x), int(self.y + offset_y)), int(self.size))
-
-
-class FallingItem:
-    def __init__(self, difficulty_multiplier=1.0):
-        self.x = random.randint(60, WINDOW_SIZE[0] - 60)
-        self.y = -50
-        self.speed = random.uniform(4, 7) * difficulty_multiplier
-        self.size = 30
-        self.angle = 0
-        self.hit_by_left = False
-        self.hit_by_right = False
+class FallingItems:
+    """
+    Toate obiectele care cad, tinute ca array-uri: un rand pe obiect, in ordinea aparitiei.
+    Miscarea si distantele pana la nas/maini se calculeaza pentru toate obiectele odata;
+    regulile (scor, combo, HP) se aplica apoi doar obiectelor cu evenimente, in ordinea randurilor,
+    deci rezultatul e acelasi ca la parcurgerea listei obiect cu obiect.
+    """
+
+    TYPES = ("EROARE", "PATCH", "BOSS")
+    EROARE, PATCH, BOSS = range(3)
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "_columns", None)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)  # y de la pasul anterior, pentru desenarea interpolata
+        self.speed = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.type = np.zeros(capacity, dtype=np.int8)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.max_hp = np.ones(capacity, dtype=np.int32)
+        self.hit_by_left = np.zeros(capacity, dtype=bool)
+        self.hit_by_right = np.zeros(capacity, dtype=bool)
+        self._columns = (self.x, self.y, self.prev_y, self.speed, self.size, self.type, self.hp, self.max_hp,
+                         self.hit_by_left, self.hit_by_right)
+        if old is not None:
+            for column, previous in zip(self._columns, old):
+                column[:self.count] = previous[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, difficulty_multiplier=1.0):
+        if self.count == len(self.x):
+            self._allocate(2 * len(self.x))
+        i = self.count
+        self.x[i] = random.randint(60, WINDOW_SIZE[0] - 60)
+        self.y[i] = -50
+        self.prev_y[i] = -50
+        self.speed[i] = random.uniform(4, 7) * difficulty_multiplier
+        self.size[i] = 30
+        self.hit_by_left[i] = False
+        self.hit_by_right[i] = False
 
         rand_val = random.random()
         if rand_val < 0.4:
-            self.type = "EROARE"
+            self.type[i] = self.EROARE
         elif rand_val < 0.9:
-            self.type = "PATCH"
+            self.type[i] = self.PATCH
         else:
-            self.type = "BOSS"
-            self.hp = 5
-            self.max_hp = 5
-            self.size = 50
-            self.speed *= 0.5
+            self.type[i] = self.BOSS
+            self.hp[i] = 5
+            self.max_hp[i] = 5
+            self.size[i] = 50
+            self.speed[i] *= 0.5
+        self.count += 1
 
     def move(self):
-        self.y += self.speed
-        self.angle += 5
-
-    def draw(self, surface, font_boss, font_small, offset_x=0, offset_y=0):
-        draw_x = int(self.x + offset_x)
-        draw_y = int(self.y + offset_y)
-
-        if self.type == "EROARE":
-            pulse = math.sin(pygame.time.get_ticks() * 0.01) * 4
-            r = int(self.size + pulse)
-            pygame.draw.circle(surface, COLOR_ERROR, (draw_x, draw_y), r)
-            pygame.draw.circle(surface, (150, 0, 0), (draw_x, draw_y), int(self.size - 8))
-            pygame.draw.line(surface, (255, 255, 255), (draw_x - 8, draw_y - 8), (draw_x + 8, draw_y + 8), 3)
-            pygame.draw.line(surface, (255, 255, 255), (draw_x + 8, draw_y - 8), (draw_x - 8, draw_y + 8), 3)
-
-        elif self.type == "PATCH":
-            pulse = math.sin(pygame.time.get_ticks() * 0.01) * 3
-            w = self.size * 2 + pulse
-            rect = pygame.Rect(draw_x - self.size, draw_y - self.size, w, w)
-            pygame.draw.rect(surface, COLOR_PATCH, rect, border_radius=6)
-            pygame.draw.rect(surface, (200, 255, 255), rect, 2, border_radius=6)
-            txt = font_small.render("PATCH", True, (255, 255, 255))
-            surface.blit(txt, (draw_x - txt.get_width() // 2, draw_y - txt.get_height() // 2))
-
-        elif self.type == "BOSS":
-            pulse = math.sin(pygame.time.get_ticks() * 0.05) * 5
-            r = int(self.size + pulse)
-            pygame.draw.circle(surface, COLOR_BOSS, (draw_x, draw_y), r)
-            pygame.draw.circle(surface, (255, 255, 255), (draw_x, draw_y), r, 3)
-            text_surf = font_boss.render("RESTANTA", True, (255, 255, 255))
-            surface.blit(text_surf, (draw_x - text_surf.get_width() // 2, draw_y - 10))
-
-            bar_width = 60
-            bar_height = 8
-            fill_width = int((self.hp / self.max_hp) * bar_width)
-            bar_x = draw_x - bar_width // 2
-            bar_y = draw_y - self.size - 15
-            pygame.draw.rect(surface, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height))
-            pygame.draw.rect(surface, (255, 0, 0), (bar_x, bar_y, fill_width, bar_height))
+        """Un pas de simulare (1 / SIM_HZ secunde)."""
+        n = self.count
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] += self.speed[:n]
+
+    def draw(self, surface, item_sprites, offset_x=0, offset_y=0, alpha=1.0):
+        """alpha: cat din ultimul pas sa desenam (interpolare intre prev_y si y)."""
+        ticks = pygame.time.get_ticks()
+        n = self.count
+        ys = (self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha).tolist()
+        for i in range(n):
+            draw_x = int(self.x[i] + offset_x)
+            draw_y = int(ys[i] + offset_y)
+            item_type = self.type[i]
+
+            # Forma (cu pulsul ei) e pre-randata: un singur blit
+            item_sprites[self.TYPES[item_type]].blit(surface, (draw_x, draw_y), ticks)
+
+            if item_type == self.BOSS:
+                bar_width = 60
+                bar_height = 8
+                fill_width = int((self.hp[i] / self.max_hp[i]) * bar_width)
+                bar_x = draw_x - bar_width // 2
+                bar_y = draw_y - self.size[i] - 15
+                pygame.draw.rect(surface, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height))
+                pygame.draw.rect(surface, (255, 0, 0), (bar_x, bar_y, fill_width, bar_height))
+
+    def collide(self, nose, l_hand, r_hand, floor_y):
+        """
+        Aplica loviturile pe obiecte si scoate obiectele terminate (o singura compactare).
+        Returneaza evenimentele in ordinea obiectelor: lista de (eveniment, x, y), unde eveniment e
+        PATCH_PIERDUT, BOSS_SCAPAT, BOSS_LOVIT, BOSS_INVINS, BOSS_CAP, EROARE_CAP sau PATCH_PRINS.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        x, y, item_type = self.x[:n], self.y[:n], self.type[:n]
+
+        fallen = y > floor_y
+        hit_radius = self.size[:n] + 25
+        on_nose = np.hypot(x - nose[0], y - nose[1]) < hit_radius
+        on_lh = np.hypot(x - l_hand[0], y - l_hand[1]) < hit_radius
+        on_rh = np.hypot(x - r_hand[0], y - r_hand[1]) < hit_radius
+
+        # Boss: fiecare mana loveste o data pe atingere (pana iese din raza)
+        boss = (item_type == self.BOSS) & ~fallen
+        new_left = boss & on_lh & ~self.hit_by_left[:n]
+        new_right = boss & on_rh & ~self.hit_by_right[:n]
+        self.hp[:n] -= new_left.astype(np.int32) + new_right.astype(np.int32)
+        self.hit_by_left[:n] = np.where(boss, on_lh, self.hit_by_left[:n])
+        self.hit_by_right[:n] = np.where(boss, on_rh, self.hit_by_right[:n])
+        boss_killed = boss & (self.hp[:n] <= 0)
+        boss_nose = boss & ~boss_killed & on_nose
+
+        error_nose = (item_type == self.EROARE) & ~fallen & on_nose
+        patch_caught = (item_type == self.PATCH) & ~fallen & (on_lh | on_rh)
+
+        removed = fallen | boss_killed | boss_nose | error_nose | patch_caught
+        events = []
+        for i in np.flatnonzero(removed | new_left | new_right):
+            pos = (self.x[i], self.y[i])
+            if fallen[i]:
+                if item_type[i] == self.PATCH:
+                    events.append(("PATCH_PIERDUT",) + pos)
+                elif item_type[i] == self.BOSS:
+                    events.append(("BOSS_SCAPAT",) + pos)
+                continue
+            if new_left[i]:
+                events.append(("BOSS_LOVIT",) + pos)
+            if new_right[i]:
+                events.append(("BOSS_LOVIT",) + pos)
+            if boss_killed[i]:
+                events.append(("BOSS_INVINS",) + pos)
+            elif boss_nose[i]:
+                events.append(("BOSS_CAP",) + pos)
+            elif error_nose[i]:
+                events.append(("EROARE_CAP",) + pos)
+            elif patch_caught[i]:
+                events.append(("PATCH_PRINS",) + pos)
+
+        if removed.any():
+            keep = np.flatnonzero(~removed)
+            for column in self._columns:
+                column[:len(keep)] = column[keep]
+            self.count = len(keep)
+        return events
+
+
+def create_item_sprites(font_boss, font_small):
+    """Cadrele de puls pentru fiecare tip din FallingItems (dupa ce fereastra e deschisa)."""
+
+    def draw_error(surf, center, r):
+        x, y = center
+        pygame.draw.circle(surf, COLOR_ERROR, center, r)
+        pygame.draw.circle(surf, (150, 0, 0), center, 30 - 8)
+        pygame.draw.line(surf, (255, 255, 255), (x - 8, y - 8), (x + 8, y + 8), 3)
+        pygame.draw.line(surf, (255, 255, 255), (x + 8, y - 8), (x - 8, y + 8), 3)
+
+    def draw_patch(surf, center, w):
+        x, y = center
+        rect = pygame.Rect(x - 30, y - 30, w, w)
+        pygame.draw.rect(surf, COLOR_PATCH, rect, border_radius=6)
+        pygame.draw.rect(surf, (200, 255, 255), rect, 2, border_radius=6)
+        txt = text_cache.render(font_small, "PATCH", (255, 255, 255))
+        surf.blit(txt, (x - txt.get_width() // 2, y - txt.get_height() // 2))
+
+    def draw_boss(surf, center, r):
+        x, y = center
+        pygame.draw.circle(surf, COLOR_BOSS, center, r)
+        pygame.draw.circle(surf, (255, 255, 255), center, r, 3)
+        text_surf = text_cache.render(font_boss, "RESTANTA", (255, 255, 255))
+        surf.blit(text_surf, (x - text_surf.get_width() // 2, y - 10))
+
+    return {
+        "EROARE": sprites.PulseSprite(draw_error, base=30, amplitude=4, speed=0.01),
+        "PATCH": sprites.PulseSprite(draw_patch, base=60, amplitude=3, speed=0.01),
+        "BOSS": sprites.PulseSprite(draw_boss, base=50, amplitude=5, speed=0.05),
+    }
 
 
 def main():
@@ -137,344 +258,363 @@ def main():
     screen = pygame.display.set_mode(WINDOW_SIZE, pygame.NOFRAME)
     pygame.display.set_caption("IT Defender - Smooth Edition")
     clock = pygame.time.Clock()
+    sim_clock = game_clock.GameClock(SIM_HZ)
 
-    cap = cv2.VideoCapture(0)
+    cap = resources.get_camera()
+    # Fundalul: frame-ul RGB (acelasi trimis la pose) intunecat direct in Surface-ul presenter-ului
+    presenter = frame_presenter.FramePresenter(WINDOW_SIZE, "RGB", alpha=BACKGROUND_DIM * 255)
+    # Buffer refolosit pentru frame-ul micsorat si oglindit (BGR)
+    frame_buf = np.empty((WINDOW_SIZE[1], WINDOW_SIZE[0], 3), np.uint8)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
 
-    # --- FONTS ---
-    font_ui = pygame.font.SysFont('Consolas', 20, bold=True)
-    font_small = pygame.font.SysFont('Arial', 12, bold=True)
-    font_boss = pygame.font.SysFont('Consolas', 18, bold=True)
-    font_combo = pygame.font.SysFont('Impact', 30)
-    font_big = pygame.font.SysFont('Consolas', 40, bold=True)
-    font_leaderboard = pygame.font.SysFont('Consolas', 25, bold=True)
-
-    items = []
-    particles = []
-    spawn_timer = 0
-    score = 0
-    health = 100
-
-    game_over = False
-
-    input_name = ""
-    saved_to_leaderboard = False
-    current_leaderboard_data = []
-    awaiting_name = False  # Stare pentru a aștepta numele (dacă scorul e Highscore)
-
-    combo = 0
-    max_combo = 0
-    difficulty = 1.0
-    screen_shake = 0
-
-    # --- VARIABILE PENTRU SMOOTHING ---
-    cx, cy = WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2
-    curr_nose = (cx, cy)
-    curr_l_hand = (cx - 50, cy + 50)
-    curr_r_hand = (cx + 50, cy + 50)
-    curr_l_sh = (cx - 30, cy)
-    curr_r_sh = (cx + 30, cy)
-    curr_l_elb = (cx - 40, cy + 30)
-    curr_r_elb = (cx + 40, cy + 30)
-
-    running = True
-    while running:
-        # --- EVENIMENTE ---
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            if game_over:
-                # LOGICA NOUA: AȘTEAPTĂ NUMELE PENTRU UN NOU HIGH SCORE (Pasul 2, 3)
-                if awaiting_name and not saved_to_leaderboard:
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_BACKSPACE:
-                            input_name = input_name[:-1]
-                        elif event.key == pygame.K_RETURN:
-                            if len(input_name) == 3:
-                                # PASUL 3: Chemati update_leaderboard (salvarea scorului în CSV)
-                                leaderboard.update_leaderboard(input_name, score, LEADERBOARD_GAME_FILE)
-
-                                # PASUL 4: Chemati import_highscores (citirea datelor noi)
-                                current_leaderboard_data = leaderboard.import_highscores(LEADERBOARD_GAME_FILE)
-
-                                saved_to_leaderboard = True
+    # Pose ruleaza pe thread separat; bucla de randare foloseste ultimul rezultat publicat
+    pose = resources.get_model("pose", create_pose)
+    pose_worker = inference.InferenceWorker(pose.process, name="PoseWorker")
+    last_frame_seq = 0
+
+    # Curatenia ruleaza si daca jocul cade cu exceptie (altfel workerul si fereastra raman deschise)
+    try:
+        # --- FONTS ---
+        font_ui = pygame.font.SysFont('Consolas', 20, bold=True)
+        font_small = pygame.font.SysFont('Arial', 12, bold=True)
+        font_boss = pygame.font.SysFont('Consolas', 18, bold=True)
+        font_combo = pygame.font.SysFont('Impact', 30)
+        font_big = pygame.font.SysFont('Consolas', 40, bold=True)
+        font_leaderboard = pygame.font.SysFont('Consolas', 25, bold=True)
+        # Scorul si HP-ul se schimba des: le compunem din glife randate o singura data
+        score_digits = text_cache.DigitAtlas(font_ui, COLOR_PATCH, "SCOR")
+        hp_digits = text_cache.DigitAtlas(font_ui, (255, 255, 255), "HP")
+        item_sprites = create_item_sprites(font_boss, font_small)
+
+        items = FallingItems()
+        particles = particle_pool.ParticlePool()
+        spawn_timer = 0
+        score = 0
+        health = 100
+
+        game_over = False
+
+        input_name = ""
+        saved_to_leaderboard = False
+        current_leaderboard_data = []
+        awaiting_name = False  # Stare pentru a aștepta numele (dacă scorul e Highscore)
+
+        combo = 0
+        max_combo = 0
+        difficulty = 1.0
+        screen_shake = 0
+
+        # --- VARIABILE PENTRU SMOOTHING ---
+        cx, cy = WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2
+        curr_nose = (cx, cy)
+        curr_l_hand = (cx - 50, cy + 50)
+        curr_r_hand = (cx + 50, cy + 50)
+        curr_l_sh = (cx - 30, cy)
+        curr_r_sh = (cx + 30, cy)
+        curr_l_elb = (cx - 40, cy + 30)
+        curr_r_elb = (cx + 40, cy + 30)
+
+        # Cate un predictor pentru fiecare punct, in ordinea: nas, maini, umeri, coate
+        predictors = [prediction.PointPredictor() for _ in range(7)]
+        last_pose_seq = 0
+
+        running = True
+        while running:
+            # --- EVENIMENTE ---
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                if game_over:
+                    # LOGICA NOUA: AȘTEAPTĂ NUMELE PENTRU UN NOU HIGH SCORE (Pasul 2, 3)
+                    if awaiting_name and not saved_to_leaderboard:
+                        if event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_BACKSPACE:
+                                input_name = input_name[:-1]
+                            elif event.key == pygame.K_RETURN:
+                                if len(input_name) == 3:
+                                    # PASUL 3+4: Salvare in fundal (CSV), clasamentul actualizat vine din memorie
+                                    current_leaderboard_data = leaderboard.submit_score(input_name, score,
+                                                                                        LEADERBOARD_GAME_FILE)
+
+                                    saved_to_leaderboard = True
+                                    awaiting_name = False
+                            elif len(input_name) < 3:
+                                if event.unicode.isalnum():
+                                    input_name += event.unicode.upper()
+
+                    # LOGICA AFISARE CLASAMENT SAU DACA NU E HIGH SCORE (ready for reboot)
+                    else:
+                        if event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_SPACE:
+                                # RESETARE JOC
+                                items.clear()
+                                particles.clear()
+                                score = 0
+                                health = 100
+                                combo = 0
+                                max_combo = 0
+                                difficulty = 1.0
+                                input_name = ""
+                                saved_to_leaderboard = False
                                 awaiting_name = False
-                        elif len(input_name) < 3:
-                            if event.unicode.isalnum():
-                                input_name += event.unicode.upper()
-
-                # LOGICA AFISARE CLASAMENT SAU DACA NU E HIGH SCORE (ready for reboot)
+                                game_over = False
+                            if event.key == pygame.K_ESCAPE:
+                                running = False
                 else:
                     if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_SPACE:
-                            # RESETARE JOC
-                            items = []
-                            particles = []
-                            score = 0
-                            health = 100
-                            combo = 0
-                            max_combo = 0
-                            difficulty = 1.0
-                            input_name = ""
-                            saved_to_leaderboard = False
-                            awaiting_name = False
-                            game_over = False
                         if event.key == pygame.K_ESCAPE:
                             running = False
-            else:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-
-        ret, frame = cap.read()
-        if not ret: break
-
-        frame = cv2.flip(frame, 1)
-        frame = cv2.resize(frame, WINDOW_SIZE)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(frame_rgb)
-
-        # Shake Logic
-        shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
-        shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
-        if screen_shake > 0: screen_shake -= 1
-
-        # Fundal
-        frame_dimmed = cv2.addWeighted(frame, 0.3, np.zeros(frame.shape, frame.dtype), 0, 0)
-        frame_rgb_dim = cv2.cvtColor(frame_dimmed, cv2.COLOR_BGR2RGB)
-        surf_cam = pygame.surfarray.make_surface(frame_rgb_dim.swapaxes(0, 1))
-        screen.blit(surf_cam, (shake_x, shake_y))
-
-        user_detected = False
-
-        if results.pose_landmarks:
-            user_detected = True
-            landmarks = results.pose_landmarks.landmark
-
-            def to_px(lm):
-                return (int(lm.x * WINDOW_SIZE[0]), int(lm.y * WINDOW_SIZE[1]))
-
-            # 1. Obtinem tintele BRUTE (Raw Targets)
-            target_nose = to_px(landmarks[mp_pose.PoseLandmark.NOSE])
-            target_l_hand = to_px(landmarks[mp_pose.PoseLandmark.LEFT_WRIST])
-            target_r_hand = to_px(landmarks[mp_pose.PoseLandmark.RIGHT_WRIST])
-            target_l_sh = to_px(landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER])
-            target_r_sh = to_px(landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER])
-            target_l_elb = to_px(landmarks[mp_pose.PoseLandmark.LEFT_ELBOW])
-            target_r_elb = to_px(landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW])
-
-            # 2. Aplicam LERP (Smoothing)
-            curr_nose = lerp_point(curr_nose, target_nose, SMOOTHING_FACTOR)
-            curr_l_hand = lerp_point(curr_l_hand, target_l_hand, SMOOTHING_FACTOR)
-            curr_r_hand = lerp_point(curr_r_hand, target_r_hand, SMOOTHING_FACTOR)
-            curr_l_sh = lerp_point(curr_l_sh, target_l_sh, SMOOTHING_FACTOR)
-            curr_r_sh = lerp_point(curr_r_sh, target_r_sh, SMOOTHING_FACTOR)
-            curr_l_elb = lerp_point(curr_l_elb, target_l_elb, SMOOTHING_FACTOR)
-            curr_r_elb = lerp_point(curr_r_elb, target_r_elb, SMOOTHING_FACTOR)
-
-            # Helpers desenare
-            def d_line(p1, p2, col, w):
-                pygame.draw.line(screen, col, (p1[0] + shake_x, p1[1] + shake_y), (p2[0] + shake_x, p2[1] + shake_y), w)
-
-            def d_circ(pos, col, r, w=0):
-                pygame.draw.circle(screen, col, (pos[0] + shake_x, pos[1] + shake_y), r, w)
-
-            # Desenam Scheletul folosind valorile SMOOTH (curr_)
-            d_line(curr_l_sh, curr_r_sh, COLOR_SKELETON, 3)
-            d_line(curr_l_sh, curr_l_elb, COLOR_SKELETON, 2)
-            d_line(curr_l_elb, curr_l_hand, COLOR_SKELETON, 2)
-            d_line(curr_r_sh, curr_r_elb, COLOR_SKELETON, 2)
-            d_line(curr_r_elb, curr_r_hand, COLOR_SKELETON, 2)
-
-            d_circ(curr_nose, COLOR_HEAD_ZONE, 12)
-            d_circ(curr_nose, (255, 50, 50), 25, 2)
-
-            glow = 20 + int(math.sin(pygame.time.get_ticks() * 0.02) * 5)
-            d_circ(curr_l_hand, COLOR_PATCH, glow)
-            d_circ(curr_r_hand, COLOR_PATCH, glow)
 
-        else:
-            msg = font_ui.render("SCANARE... INTRA IN CADRU", True, (0, 255, 0))
-            screen.blit(msg, (WINDOW_SIZE[0] // 2 - msg.get_width() // 2, WINDOW_SIZE[1] // 2))
-
-        if not game_over and user_detected:
-            difficulty = 1.0 + (score / 500.0)
-            spawn_timer += 1
-            if spawn_timer > max(20, 45 - int(score / 100)):
-                items.append(FallingItem(difficulty))
-                spawn_timer = 0
-
-            for item in items[:]:
-                item.move()
-                item.draw(screen, font_boss, font_small, shake_x, shake_y)
-
-                if item.y > WINDOW_SIZE[1]:
-                    if item.type == "PATCH":
-                        combo = 0
-                        screen_shake = 5
-                    if item.type == "BOSS":
-                        health -= 30
-                        screen_shake = 20
-                        combo = 0
-                    items.remove(item)
-                    continue
-
-                # Folosim coordonatele SMOOTH pentru detectia coliziunilor!
-                dist_nose = math.hypot(item.x - curr_nose[0], item.y - curr_nose[1])
-                dist_lh = math.hypot(item.x - curr_l_hand[0], item.y - curr_l_hand[1])
-                dist_rh = math.hypot(item.x - curr_r_hand[0], item.y - curr_r_hand[1])
-                hit_radius = item.size + 25
-
-                if item.type == "BOSS":
-                    if dist_lh < hit_radius:
-                        if not item.hit_by_left:
-                            item.hp -= 1
-                            item.hit_by_left = True
-                            screen_shake = 8
-                            for _ in range(5): particles.append(Particle(item.x, item.y, (255, 255, 255)))
-                    else:
-                        item.hit_by_left = False
+            frame, frame_seq, frame_ts = cap.latest()
+            if frame is None: break
+            # Cati pasi de simulare avem de recuperat pentru timpul trecut de la frame-ul anterior
+            steps = sim_clock.advance()
+
+            # Resize + flip in acelasi buffer (frame-ul din camera nu se modifica)
+            cv2.resize(frame, WINDOW_SIZE, dst=frame_buf)
+            cv2.flip(frame_buf, 1, dst=frame_buf)
+            # frame_rgb e nou la fiecare frame: il citeste worker-ul de pose pe alt thread
+            frame_rgb = cv2.cvtColor(frame_buf, cv2.COLOR_BGR2RGB)
+
+            # Trimitem doar frame-uri noi; nu asteptam niciodata modelul
+            if frame_seq != last_frame_seq:
+                pose_worker.submit(frame_rgb, frame_ts)
+                last_frame_seq = frame_seq
+            pose_out = pose_worker.latest()
+            results = pose_out.result
+
+            # Shake Logic
+            shake_x = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+            shake_y = random.randint(-screen_shake, screen_shake) if screen_shake > 0 else 0
+
+            # Fundal
+            screen.blit(presenter.present(frame_rgb), (shake_x, shake_y))
+
+            user_detected = False
+
+            if results and results.pose_landmarks:
+                user_detected = True
+                landmarks = results.pose_landmarks.landmark
+
+                def to_px(lm):
+                    return (int(lm.x * WINDOW_SIZE[0]), int(lm.y * WINDOW_SIZE[1]))
+
+                # 1. Obtinem tintele BRUTE (Raw Targets)
+                target_nose = to_px(landmarks[mp_pose.PoseLandmark.NOSE])
+                target_l_hand = to_px(landmarks[mp_pose.PoseLandmark.LEFT_WRIST])
+                target_r_hand = to_px(landmarks[mp_pose.PoseLandmark.RIGHT_WRIST])
+                target_l_sh = to_px(landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER])
+                target_r_sh = to_px(landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER])
+                target_l_elb = to_px(landmarks[mp_pose.PoseLandmark.LEFT_ELBOW])
+                target_r_elb = to_px(landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW])
+
+                if SMOOTHING_MODE == "predict":
+                    # 2. Filtram masuratorile noi si extrapolam la momentul randarii
+                    targets = [target_nose, target_l_hand, target_r_hand, target_l_sh, target_r_sh,
+                               target_l_elb, target_r_elb]
+                    if pose_out.seq != last_pose_seq:
+                        last_pose_seq = pose_out.seq
+                        for predictor, target in zip(predictors, targets):
+                            predictor.update(target, pose_out.timestamp)
+
+                    now = time.monotonic()
+                    curr_nose, curr_l_hand, curr_r_hand, curr_l_sh, curr_r_sh, curr_l_elb, curr_r_elb = [
+                        predictor.predict(now) for predictor in predictors
+                    ]
+                else:
+                    # 2. Aplicam LERP (Smoothing), cate SMOOTHING_FACTOR pe fiecare pas de simulare
+                    lerp_alpha = game_clock.smoothing(SMOOTHING_FACTOR, steps)
+                    curr_nose = lerp_point(curr_nose, target_nose, lerp_alpha)
+                    curr_l_hand = lerp_point(curr_l_hand, target_l_hand, lerp_alpha)
+                    curr_r_hand = lerp_point(curr_r_hand, target_r_hand, lerp_alpha)
+                    curr_l_sh = lerp_point(curr_l_sh, target_l_sh, lerp_alpha)
+                    curr_r_sh = lerp_point(curr_r_sh, target_r_sh, lerp_alpha)
+                    curr_l_elb = lerp_point(curr_l_elb, target_l_elb, lerp_alpha)
+                    curr_r_elb = lerp_point(curr_r_elb, target_r_elb, lerp_alpha)
+
+                # Helpers desenare
+                def d_line(p1, p2, col, w):
+                    pygame.draw.line(screen, col, (p1[0] + shake_x, p1[1] + shake_y),
+                                     (p2[0] + shake_x, p2[1] + shake_y), w)
+
+                def d_circ(pos, col, r, w=0):
+                    pygame.draw.circle(screen, col, (pos[0] + shake_x, pos[1] + shake_y), r, w)
+
+                # Desenam Scheletul folosind valorile SMOOTH (curr_)
+                d_line(curr_l_sh, curr_r_sh, COLOR_SKELETON, 3)
+                d_line(curr_l_sh, curr_l_elb, COLOR_SKELETON, 2)
+                d_line(curr_l_elb, curr_l_hand, COLOR_SKELETON, 2)
+                d_line(curr_r_sh, curr_r_elb, COLOR_SKELETON, 2)
+                d_line(curr_r_elb, curr_r_hand, COLOR_SKELETON, 2)
+
+                d_circ(curr_nose, COLOR_HEAD_ZONE, 12)
+                d_circ(curr_nose, (255, 50, 50), 25, 2)
+
+                glow = 20 + int(math.sin(pygame.time.get_ticks() * 0.02) * 5)
+                d_circ(curr_l_hand, COLOR_PATCH, glow)
+                d_circ(curr_r_hand, COLOR_PATCH, glow)
 
-                    if dist_rh < hit_radius:
-                        if not item.hit_by_right:
-                            item.hp -= 1
-                            item.hit_by_right = True
+            else:
+                msg = text_cache.render(font_ui, "SCANARE... INTRA IN CADRU", (0, 255, 0))
+                screen.blit(msg, (WINDOW_SIZE[0] // 2 - msg.get_width() // 2, WINDOW_SIZE[1] // 2))
+
+            # --- SIMULARE (pas fix) ---
+            items_drawn = False
+            for step in range(steps):
+                if screen_shake > 0: screen_shake -= 1
+
+                if not game_over and user_detected:
+                    difficulty = 1.0 + (score / 500.0)
+                    spawn_timer += 1
+                    if spawn_timer > max(20, 45 - int(score / 100)):
+                        items.spawn(difficulty)
+                        spawn_timer = 0
+
+                    items.move()
+                    if step == steps - 1:
+                        # Ca in bucla originala: desenam dupa miscare si inainte de coliziune, deci
+                        # obiectul prins sau lovit pe ultimul pas apare pe ecran in frame-ul acesta
+                        items.draw(screen, item_sprites, shake_x, shake_y, sim_clock.alpha)
+                        items_drawn = True
+
+                    # Folosim coordonatele SMOOTH/prezise pentru detectia coliziunilor!
+                    for event, item_x, item_y in items.collide(curr_nose, curr_l_hand, curr_r_hand, WINDOW_SIZE[1]):
+                        if event == "PATCH_PIERDUT":
+                            combo = 0
+                            screen_shake = 5
+                        elif event == "BOSS_SCAPAT":
+                            health -= 30
+                            screen_shake = 20
+                            combo = 0
+                        elif event == "BOSS_LOVIT":
                             screen_shake = 8
-                            for _ in range(5): particles.append(Particle(item.x, item.y, (255, 255, 255)))
+                            particles.emit(item_x, item_y, (255, 255, 255), 5)
+                        elif event == "BOSS_INVINS":
+                            score += 100
+                            screen_shake = 20
+                            particles.emit(item_x, item_y, COLOR_BOSS, 20)
+                        elif event == "BOSS_CAP":
+                            health -= 30
+                            screen_shake = 20
+                            combo = 0
+                            particles.emit(item_x, item_y, (255, 0, 0), 15)
+                        elif event == "EROARE_CAP":
+                            health -= 15
+                            screen_shake = 15
+                            combo = 0
+                            particles.emit(item_x, item_y, (255, 50, 0), 10)
+                        elif event == "PATCH_PRINS":
+                            points = 10 + combo
+                            score += points
+                            combo += 1
+                            if combo > max_combo: max_combo = combo
+                            particles.emit(item_x, item_y, (100, 255, 255), 8)
+
+                    if health <= 0:
+                        game_over = True
+
+                        # PASUL 2: Chemati check_score (cu calea fișierului CSV)
+                        if leaderboard.check_score(score, LEADERBOARD_GAME_FILE):
+                            awaiting_name = True  # Activează starea de introducere nume
+                        else:
+                            # Dacă nu este High Score, afișăm direct clasamentul existent
+                            # PASUL 4 (pentru afișare): Chemati import_highscores
+                            current_leaderboard_data = leaderboard.import_highscores(LEADERBOARD_GAME_FILE)
+                            leaderboard.record_score(score, LEADERBOARD_GAME_FILE)  # rularea intra doar in istoric
+                            saved_to_leaderboard = True  # Afișăm direct clasamentul
+
+                particles.update()
+
+            if not game_over and user_detected and not items_drawn:
+                items.draw(screen, item_sprites, shake_x, shake_y, sim_clock.alpha)
+            particles.draw(screen, shake_x, shake_y)
+
+            # UI
+            pygame.draw.rect(screen, (0, 0, 0), (10, 10, 180, 40), border_radius=10)
+            pygame.draw.rect(screen, COLOR_PATCH, (10, 10, 180, 40), 2, border_radius=10)
+            score_digits.render_to(screen, f"SCOR: {score}", (20, 18))
+
+            if combo > 1:
+                combo_col = (255, 255, 0) if combo < 10 else (255, 0, 255)
+                combo_surf = text_cache.render(font_combo, f"{combo}x COMBO!", combo_col)
+                screen.blit(combo_surf, (20, 60))
+
+            bar_max_w = 200
+            x_bar = WINDOW_SIZE[0] - bar_max_w - 20
+            pygame.draw.rect(screen, (0, 0, 0), (x_bar - 10, 10, bar_max_w + 20, 40), border_radius=10)
+            pygame.draw.rect(screen, (50, 0, 0), (x_bar, 18, bar_max_w, 24))
+
+            if health > 0:
+                width_hp = int(bar_max_w * (health / 100))
+                hp_color = (0, 255, 0)
+                if health < 50: hp_color = (255, 255, 0)
+                if health < 25: hp_color = (255, 0, 0)
+                pygame.draw.rect(screen, hp_color, (x_bar, 18, width_hp, 24))
+
+            hp_digits.render_to(screen, f"HP: {health}%", (x_bar, 45))
+
+            if game_over:
+                overlay = pygame.Surface(WINDOW_SIZE)
+                overlay.set_alpha(240)
+                overlay.fill((0, 0, 0))
+                screen.blit(overlay, (0, 0))
+
+                cx, cy = WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2
+                txt_over = text_cache.render(font_big, "SISTEM CAZUT", (255, 50, 50))
+                screen.blit(txt_over, (cx - txt_over.get_width() // 2, 40))
+
+                # Afisare camp de introducere nume (Pasul 2, 3)
+                if awaiting_name and not saved_to_leaderboard:
+                    txt_score = text_cache.render(font_ui, f"SCOR FINAL: {score}", COLOR_PATCH)
+                    screen.blit(txt_score, (cx - txt_score.get_width() // 2, 100))
+                    txt_prompt = text_cache.render(font_ui, "HIGH SCORE! INTRODUCE INITIALE (3):", (255, 255, 255))
+                    screen.blit(txt_prompt, (cx - txt_prompt.get_width() // 2, 180))
+
+                    input_rect = pygame.Rect(cx - 100, 220, 200, 60)
+                    pygame.draw.rect(screen, COLOR_INPUT_BG, input_rect)
+                    pygame.draw.rect(screen, COLOR_PATCH, input_rect, 3)
+                    txt_input = text_cache.render(font_big, input_name, (255, 255, 0))
+                    screen.blit(txt_input, (cx - txt_input.get_width() // 2, 230))
+
+                    if len(input_name) == 3:
+                        txt_enter = text_cache.render(font_ui, "APASA [ENTER] PENTRU A SALVA", (0, 255, 0))
+                        if (pygame.time.get_ticks() // 500) % 2 == 0:
+                            screen.blit(txt_enter, (cx - txt_enter.get_width() // 2, 300))
                     else:
-                        item.hit_by_right = False
-
-                    if item.hp <= 0:
-                        score += 100
-                        items.remove(item)
-                        screen_shake = 20
-                        for _ in range(20): particles.append(Particle(item.x, item.y, COLOR_BOSS))
-                        continue
-
-                    if dist_nose < hit_radius:
-                        health -= 30
-                        items.remove(item)
-                        screen_shake = 20
-                        combo = 0
-                        for _ in range(15): particles.append(Particle(item.x, item.y, (255, 0, 0)))
-
-                elif item.type == "EROARE":
-                    if dist_nose < hit_radius:
-                        health -= 15
-                        items.remove(item)
-                        screen_shake = 15
-                        combo = 0
-                        for _ in range(10): particles.append(Particle(item.x, item.y, (255, 50, 0)))
-
-                elif item.type == "PATCH":
-                    if dist_lh < hit_radius or dist_rh < hit_radius:
-                        points = 10 + combo
-                        score += points
-                        combo += 1
-                        if combo > max_combo: max_combo = combo
-                        items.remove(item)
-                        for _ in range(8): particles.append(Particle(item.x, item.y, (100, 255, 255)))
-
-            if health <= 0:
-                game_over = True
-
-                # PASUL 2: Chemati check_score (cu calea fișierului CSV)
-                if leaderboard.check_score(score, LEADERBOARD_GAME_FILE):
-                    awaiting_name = True  # Activează starea de introducere nume
-                else:
-                    # Dacă nu este High Score, afișăm direct clasamentul existent
-                    # PASUL 4 (pentru afișare): Chemati import_highscores
-                    current_leaderboard_data = leaderboard.import_highscores(LEADERBOARD_GAME_FILE)
-                    saved_to_leaderboard = True  # Afișăm direct clasamentul
-
-        for p in particles[:]:
-            p.update()
-            p.draw(screen, shake_x, shake_y)
-            if p.life <= 0: particles.remove(p)
-
-        # UI
-        pygame.draw.rect(screen, (0, 0, 0), (10, 10, 180, 40), border_radius=10)
-        pygame.draw.rect(screen, COLOR_PATCH, (10, 10, 180, 40), 2, border_radius=10)
-        screen.blit(font_ui.render(f"SCOR: {score}", True, COLOR_PATCH), (20, 18))
-
-        if combo > 1:
-            combo_col = (255, 255, 0) if combo < 10 else (255, 0, 255)
-            combo_surf = font_combo.render(f"{combo}x COMBO!", True, combo_col)
-            screen.blit(combo_surf, (20, 60))
-
-        bar_max_w = 200
-        x_bar = WINDOW_SIZE[0] - bar_max_w - 20
-        pygame.draw.rect(screen, (0, 0, 0), (x_bar - 10, 10, bar_max_w + 20, 40), border_radius=10)
-        pygame.draw.rect(screen, (50, 0, 0), (x_bar, 18, bar_max_w, 24))
-
-        if health > 0:
-            width_hp = int(bar_max_w * (health / 100))
-            hp_color = (0, 255, 0)
-            if health < 50: hp_color = (255, 255, 0)
-            if health < 25: hp_color = (255, 0, 0)
-            pygame.draw.rect(screen, hp_color, (x_bar, 18, width_hp, 24))
-
-        screen.blit(font_ui.render(f"HP: {health}%", True, (255, 255, 255)), (x_bar, 45))
-
-        if game_over:
-            overlay = pygame.Surface(WINDOW_SIZE)
-            overlay.set_alpha(240)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
-
-            cx, cy = WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2
-            txt_over = font_big.render("SISTEM CAZUT", True, (255, 50, 50))
-            screen.blit(txt_over, (cx - txt_over.get_width() // 2, 40))
-
-            # Afisare camp de introducere nume (Pasul 2, 3)
-            if awaiting_name and not saved_to_leaderboard:
-                txt_score = font_ui.render(f"SCOR FINAL: {score}", True, COLOR_PATCH)
-                screen.blit(txt_score, (cx - txt_score.get_width() // 2, 100))
-                txt_prompt = font_ui.render("HIGH SCORE! INTRODUCE INITIALE (3):", True, (255, 255, 255))
-                screen.blit(txt_prompt, (cx - txt_prompt.get_width() // 2, 180))
-
-                input_rect = pygame.Rect(cx - 100, 220, 200, 60)
-                pygame.draw.rect(screen, COLOR_INPUT_BG, input_rect)
-                pygame.draw.rect(screen, COLOR_PATCH, input_rect, 3)
-                txt_input = font_big.render(input_name, True, (255, 255, 0))
-                screen.blit(txt_input, (cx - txt_input.get_width() // 2, 230))
-
-                if len(input_name) == 3:
-                    txt_enter = font_ui.render("APASA [ENTER] PENTRU A SALVA", True, (0, 255, 0))
-                    if (pygame.time.get_ticks() // 500) % 2 == 0:
-                        screen.blit(txt_enter, (cx - txt_enter.get_width() // 2, 300))
-                else:
-                    txt_info = font_small.render("Tastatura necesara", True, (150, 150, 150))
-                    screen.blit(txt_info, (cx - txt_info.get_width() // 2, 300))
-
-            # Afisare Leaderboard (Pasul 5)
-            elif saved_to_leaderboard:
-                txt_lb_title = font_leaderboard.render("TOP 5 HACKERS", True, COLOR_HIGHSCORE)
-                screen.blit(txt_lb_title, (cx - txt_lb_title.get_width() // 2, 100))
-                start_y = 160
-
-                # Afișarea datelor din lista returnată de import_highscores()
-                for i, (name, s) in enumerate(current_leaderboard_data):
-                    # Afișăm primele 5 rezultate, chiar dacă modulul returnează 10
-                    if i >= 5: break
-
-                    color = COLOR_HIGHSCORE if i == 0 else (255, 255, 255)
-                    txt_name = font_ui.render(f"{i + 1}. {name}", True, color)
-                    txt_sc = font_ui.render(str(s), True, color)
-                    screen.blit(txt_name, (cx - 150, start_y + i * 35))
-                    screen.blit(txt_sc, (cx + 80, start_y + i * 35))
-
-                txt_restart = font_ui.render("Apasa SPACE pentru Reboot", True, COLOR_PATCH)
-                if (pygame.time.get_ticks() // 700) % 2 == 0:
-                    screen.blit(txt_restart, (cx - txt_restart.get_width() // 2, 380))
-
-        pygame.display.flip()
-        clock.tick(30)
-
-    cap.release()
-    pygame.quit()
+                        txt_info = text_cache.render(font_small, "Tastatura necesara", (150, 150, 150))
+                        screen.blit(txt_info, (cx - txt_info.get_width() // 2, 300))
+
+                # Afisare Leaderboard (Pasul 5)
+                elif saved_to_leaderboard:
+                    txt_lb_title = text_cache.render(font_leaderboard, "TOP 5 HACKERS", COLOR_HIGHSCORE)
+                    screen.blit(txt_lb_title, (cx - txt_lb_title.get_width() // 2, 100))
+                    start_y = 160
+
+                    # Afișarea datelor din lista returnată de import_highscores()
+                    for i, (name, s) in enumerate(current_leaderboard_data):
+                        # Afișăm primele 5 rezultate, chiar dacă modulul returnează 10
+                        if i >= 5: break
+
+                        color = COLOR_HIGHSCORE if i == 0 else (255, 255, 255)
+                        txt_name = text_cache.render(font_ui, f"{i + 1}. {name}", color)
+                        txt_sc = text_cache.render(font_ui, str(s), color)
+                        screen.blit(txt_name, (cx - 150, start_y + i * 35))
+                        screen.blit(txt_sc, (cx + 80, start_y + i * 35))
+
+                    txt_restart = text_cache.render(font_ui, "Apasa SPACE pentru Reboot", COLOR_PATCH)
+                    if (pygame.time.get_ticks() // 700) % 2 == 0:
+                        screen.blit(txt_restart, (cx - txt_restart.get_width() // 2, 380))
+
+            pygame.display.flip()
+            clock.tick(RENDER_FPS)
+    finally:
+        pose_worker.stop()
+        resources.release_model("pose")
+        resources.release_camera()
+        leaderboard.flush()
+        resources.close_display()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,318 @@
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+
+"""
+Captura camerei pe un thread separat, comuna pentru toate jocurile.
+
+Thread-ul de fundal citeste continuu din cv2.VideoCapture si pune frame-urile intr-un
+ring buffer mic. Bucla jocului ia mereu cel mai nou frame (latest-frame-wins), deci nu
+mai asteapta dupa USB; frame-urile vechi care n-au fost citite la timp sunt aruncate
+si numarate in frames_dropped.
+
+Sursa frame-urilor e interschimbabila (FrameSource): camera USB, un fisier video
+inregistrat sau un director cu imagini. Jocurile aleg sursa din variabila de mediu
+CAMERA_SOURCE, deci pot rula si fara camera (ex. pe un Linux headless pentru profiling):
+    CAMERA_SOURCE=inregistrari/lanterna.mp4 python electronica.py
+    CAMERA_SOURCE=inregistrari/pose_frames/ CAMERA_FPS=0 python benchmark.py calculatoare_joc
+
+CAMERA_FPS fixeaza rata de redare pentru fisiere/directoare (0 = cat de repede se poate).
+
+Un read() ratat de la camera (USB deconectat o clipa, driver care sughita) nu opreste
+thread-ul: reincercam cu pauze din ce in ce mai mari, iar dupa READ_FAILURES_BEFORE_REOPEN
+esecuri la rand redeschidem camera (cu setarile facute prin set()). Thread-ul se opreste
+singur doar cand o inregistrare fara loop ajunge la final.
+
+IMPLEMENTARE:
+    cap = camera.ThreadedCamera()       # in loc de cv2.VideoCapture(0)
+    ret, frame = cap.read()             # acelasi API ca VideoCapture
+    print(cap.stats())                  # {'captured': ..., 'dropped': ..., 'read': ...}
+    cap.release()
+"""
+
+FIRST_FRAME_TIMEOUT = 5.0  # Secunde cat asteptam primul frame de la camera
+DEFAULT_REPLAY_FPS = 30.0  # Folosit cand fisierul nu are FPS in metadate
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+READ_RETRY_DELAY = 0.05  # Secunde de pauza dupa primul read() ratat, se dubleaza la fiecare esec
+READ_RETRY_MAX_DELAY = 0.5  # Pauza maxima intre doua incercari
+READ_FAILURES_BEFORE_REOPEN = 10  # Esecuri la rand dupa care redeschidem sursa
+
+
+# --- SURSE DE FRAME-URI ---
+class FrameSource:
+    """Interfata comuna: read() -> (ret, frame), ca la cv2.VideoCapture."""
+
+    def read(self):
+        raise NotImplementedError
+
+    def set(self, prop_id, value):
+        return False
+
+    def get(self, prop_id):
+        return 0.0
+
+    def isOpened(self):
+        return True
+
+    def reopen(self):
+        """Incearca sa redeschida sursa dupa mai multe read() ratate; returneaza isOpened()."""
+        return self.isOpened()
+
+    def is_finished(self):
+        """True cand read() ratat inseamna sfarsitul sursei (nu o eroare trecatoare)."""
+        return False
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index=0):
+        self.index = index
+        self.cap = cv2.VideoCapture(index)
+        # Setarile facute prin set(), refacute la reopen() (expunere, rezolutie)
+        self._props = {}
+
+    def read(self):
+        return self.cap.read()
+
+    def set(self, prop_id, value):
+        self._props[prop_id] = value
+        return self.cap.set(prop_id, value)
+
+    def get(self, prop_id):
+        return self.cap.get(prop_id)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def reopen(self):
+        self.cap.release()
+        self.cap = cv2.VideoCapture(self.index)
+        for prop_id, value in self._props.items():
+            self.cap.set(prop_id, value)
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ReplaySource(FrameSource):
+    """Baza pentru surse inregistrate: tine ritmul la fps fix (None/0 = cat de repede se poate)."""
+
+    def __init__(self, fps=None, loop=False):
+        self.fps = fps
+        self.loop = loop
+        self._next_due = None
+
+    def _wait_for_next_frame(self):
+        if not self.fps:
+            return
+        now = time.monotonic()
+        if self._next_due is None:
+            self._next_due = now
+        elif now < self._next_due:
+            time.sleep(self._next_due - now)
+        self._next_due = max(self._next_due, now - 1.0 / self.fps) + 1.0 / self.fps
+
+    def _read_next(self):
+        raise NotImplementedError
+
+    def _rewind(self):
+        raise NotImplementedError
+
+    def read(self):
+        ret, frame = self._read_next()
+        if not ret and self.loop:
+            self._rewind()
+            ret, frame = self._read_next()
+        if ret:
+            self._wait_for_next_frame()
+        return ret, frame
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps or 0)
+        return 0.0
+
+    def is_finished(self):
+        # Cu loop, read() ratat dupa rewind e o eroare de citire, nu sfarsitul inregistrarii
+        return not self.loop
+
+
+class VideoFileSource(ReplaySource):
+    def __init__(self, path, fps=None, loop=False):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if fps is None:
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_REPLAY_FPS
+        super().__init__(fps, loop)
+
+    def _read_next(self):
+        return self.cap.read()
+
+    def _rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def reopen(self):
+        self.cap.release()
+        self.cap = cv2.VideoCapture(self.path)
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirSource(ReplaySource):
+    def __init__(self, path, fps=None, loop=False):
+        super().__init__(DEFAULT_REPLAY_FPS if fps is None else fps, loop)
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.index = 0
+
+    def _read_next(self):
+        while self.index < len(self.files):
+            frame = cv2.imread(self.files[self.index])
+            self.index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def _rewind(self):
+        self.index = 0
+
+    def isOpened(self):
+        return bool(self.files)
+
+
+def open_source(spec=None, fps=None, loop=False):
+    """
+    Deschide o sursa de frame-uri. spec poate fi un index de camera ("0"), un fisier video
+    sau un director cu imagini; implicit se citeste CAMERA_SOURCE (altfel camera 0).
+    """
+    if isinstance(spec, FrameSource):
+        return spec
+    if spec is None:
+        spec = os.environ.get("CAMERA_SOURCE", "0")
+    if fps is None and os.environ.get("CAMERA_FPS"):
+        fps = float(os.environ["CAMERA_FPS"])
+
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, fps, loop)
+    return VideoFileSource(spec, fps, loop)
+
+
+class ThreadedCamera:
+    def __init__(self, src=None, buffer_size=2):
+        self.cap = open_source(src)
+        self._cap_lock = threading.Lock()
+
+        # Ring buffer: (seq, timestamp, frame); deque-ul arunca singur frame-ul cel mai vechi
+        self._frames = deque(maxlen=max(1, buffer_size))
+        self._frames_lock = threading.Lock()
+        self._new_frame = threading.Event()
+
+        # Contoare (citite din bucla jocului cat timp ruleaza)
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_read = 0
+        self._last_read_seq = 0
+
+        self._running = True
+        self._stopped = False
+        self._thread = threading.Thread(target=self._reader, name="ThreadedCamera", daemon=True)
+        self._thread.start()
+
+    def _reader(self):
+        failures = 0
+        while self._running:
+            with self._cap_lock:
+                ret, frame = self.cap.read()
+            if not ret:
+                if self.cap.is_finished():
+                    break
+                failures += 1
+                if failures >= READ_FAILURES_BEFORE_REOPEN:
+                    print(f"Camera: {failures} citiri ratate la rand, redeschidem sursa.")
+                    with self._cap_lock:
+                        self.cap.reopen()
+                    failures = 0
+                else:
+                    time.sleep(min(READ_RETRY_DELAY * 2 ** (failures - 1), READ_RETRY_MAX_DELAY))
+                continue
+            failures = 0
+
+            with self._frames_lock:
+                self.frames_captured += 1
+                # Frame-ul anterior n-a fost citit de joc -> il consideram aruncat
+                if self._frames and self._frames[-1][0] > self._last_read_seq:
+                    self.frames_dropped += 1
+                self._frames.append((self.frames_captured, time.monotonic(), frame))
+            self._new_frame.set()
+
+        self._stopped = True
+        self._new_frame.set()
+
+    def latest(self, timeout=FIRST_FRAME_TIMEOUT):
+        """Returneaza (frame, seq, timestamp) pentru cel mai nou frame, fara sa blocheze dupa primul."""
+        if not self._frames:
+            self._new_frame.wait(timeout)
+
+        with self._frames_lock:
+            if not self._frames:
+                return None, 0, 0.0
+            seq, timestamp, frame = self._frames[-1]
+            # Sursa s-a terminat si am consumat deja ultimul frame
+            if self._stopped and seq <= self._last_read_seq:
+                return None, 0, 0.0
+            if seq > self._last_read_seq:
+                self._last_read_seq = seq
+            self.frames_read += 1
+            return frame, seq, timestamp
+
+    def read(self):
+        """Compatibil cu cv2.VideoCapture.read(): (ret, frame)."""
+        frame, _, _ = self.latest()
+        return frame is not None, frame
+
+    def stats(self):
+        return {
+            "captured": self.frames_captured,
+            "dropped": self.frames_dropped,
+            "read": self.frames_read,
+        }
+
+    def set(self, prop_id, value):
+        with self._cap_lock:
+            return self.cap.set(prop_id, value)
+
+    def get(self, prop_id):
+        with self._cap_lock:
+            return self.cap.get(prop_id)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def is_alive(self):
+        """False dupa ce thread-ul de citire s-a oprit (sfarsitul inregistrarii sau release())."""
+        return self._thread.is_alive()
+
+    def release(self):
+        self._running = False
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        with self._cap_lock:
+            self.cap.release()
+        stats = self.stats()
+        print(f"Camera: {stats['captured']} frame-uri capturate, {stats['dropped']} aruncate.")
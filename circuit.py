@@ -0,0 +1,210 @@
+import glob
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import cv2
+import numpy as np
+import pygame
+
+"""
+Nivelurile (placile) din electronica.py: format pe disc, compilare si harta de coliziune.
+
+Un nivel e un fisier JSON in levels/ (ordinea de rotatie = ordinea alfabetica a fisierelor):
+    {
+      "name": "Placa de baza",
+      "track_width": 50,                              # latimea implicita a firelor
+      "start": [50, 240], "finish": [750, 240],
+      "traces": [{"points": [[50, 240], [150, 240], ...], "width": 50}],   # width optional
+      "pads": [{"pos": [50, 240], "radius": 45}],                         # radius optional
+      "labels": [{"text": "START", "pos": [25, 230]}]
+    }
+
+compile_level() deseneaza placa o singura data si scoate din acelasi array:
+- surface: suprafata pygame afisata in joc;
+- circuit_mask: masca OpenCV (255 unde canalul verde > 50) pentru detectia din PLAY;
+- collision_field: CollisionField (on_track + distanta pana la marginea firului).
+Rezultatul e salvat in .cache/levels/ (cheie = continutul fisierului + rezolutia), deci la
+pornire nivelurile se incarca din .npz fara sa mai desenam sau sa rulam distanceTransform.
+
+IMPLEMENTARE:
+    levels = circuit.load_levels()                  # toate nivelurile din levels/
+    level = levels[0]
+    screen.blit(level.surface, (0, 0))
+    if not level.collision_field.is_on_track(px, py): ...       # scurtcircuit
+    if level.collision_field.distance_to_edge(px, py) < 8: ...  # aproape de margine
+"""
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "levels")
+CACHE_VERSION = 1  # se incrementeaza cand se schimba felul in care desenam nivelurile
+
+DEFAULT_LEVEL = "01_placa_de_baza.json"
+DEFAULT_TRACK_WIDTH = 50
+
+BOARD_COLOR = (20, 20, 20)
+TRACE_COLOR = (0, 200, 0)
+PAD_COLOR = (192, 192, 192)
+LABEL_COLOR = (255, 255, 255)
+
+BACKGROUND_THRESHOLD = 50  # toate canalele sub prag = placa goala (in afara firului)
+MASK_GREEN_THRESHOLD = 50  # canalul verde peste prag = circuit (pentru masca din PLAY)
+
+Level = namedtuple("Level", ["name", "surface", "circuit_mask", "collision_field", "start", "finish",
+                             "track_width"])
+
+# Nivelurile deja incarcate in proces (cand revenim in joc din harta.py nu mai citim nimic)
+_loaded = {}
+
+
+class CollisionField:
+    def __init__(self, level_surf):
+        # surfarray e (w, h, 3); trecem la (h, w, 3) ca sa indexam [y, x]
+        arr = np.transpose(pygame.surfarray.array3d(level_surf), (1, 0, 2))
+        self._set_occupancy(occupancy_from_rgb(arr))
+
+    @classmethod
+    def from_arrays(cls, on_track, edge_distance=None):
+        field = cls.__new__(cls)
+        field._set_occupancy(on_track, edge_distance)
+        return field
+
+    def _set_occupancy(self, on_track, edge_distance=None):
+        self.on_track = on_track
+        if edge_distance is None:
+            edge_distance = cv2.distanceTransform(on_track.astype(np.uint8), cv2.DIST_L2, 5)
+        self.edge_distance = edge_distance
+        self.height, self.width = on_track.shape
+
+    def _clamp(self, x, y):
+        x = max(0, min(self.width - 1, int(x)))
+        y = max(0, min(self.height - 1, int(y)))
+        return x, y
+
+    def is_on_track(self, x, y):
+        x, y = self._clamp(x, y)
+        return bool(self.on_track[y, x])
+
+    def distance_to_edge(self, x, y):
+        """Pixeli pana la cea mai apropiata margine a firului (0 daca punctul e deja in afara)."""
+        x, y = self._clamp(x, y)
+        return float(self.edge_distance[y, x])
+
+
+def occupancy_from_rgb(arr):
+    """Grila booleana (h, w): True unde placa nu e goala."""
+    return ~np.all(arr < BACKGROUND_THRESHOLD, axis=2)
+
+
+def render_level_surface(spec, size):
+    """Deseneaza placa descrisa de spec (dict din JSON) pe o suprafata noua de marimea size."""
+    surf = pygame.Surface(size)
+    surf.fill(BOARD_COLOR)
+
+    track_width = spec.get("track_width", DEFAULT_TRACK_WIDTH)
+
+    for trace in spec["traces"]:
+        points = [tuple(p) for p in trace["points"]]
+        width = trace.get("width", track_width)
+        pygame.draw.lines(surf, TRACE_COLOR, False, points, width)
+        for p in points:
+            pygame.draw.circle(surf, TRACE_COLOR, p, width // 2)
+
+    for pad in spec.get("pads", []):
+        pygame.draw.circle(surf, PAD_COLOR, tuple(pad["pos"]), pad.get("radius", track_width - 5))
+
+    font = pygame.font.SysFont('Arial', 20, bold=True)
+    for label in spec.get("labels", []):
+        surf.blit(font.render(label["text"], True, LABEL_COLOR), tuple(label["pos"]))
+
+    return surf
+
+
+def compile_level(spec, size):
+    """Returneaza (surface, circuit_mask, on_track, edge_distance) dintr-o singura desenare."""
+    surf = render_level_surface(spec, size)
+    arr = np.transpose(pygame.surfarray.array3d(surf), (1, 0, 2))
+
+    circuit_mask = np.where(arr[:, :, 1] > MASK_GREEN_THRESHOLD, 255, 0).astype(np.uint8)
+    on_track = occupancy_from_rgb(arr)
+    edge_distance = cv2.distanceTransform(on_track.astype(np.uint8), cv2.DIST_L2, 5)
+    return surf, circuit_mask, on_track, edge_distance
+
+
+def _cache_path(level_path, raw, size):
+    stem = os.path.splitext(os.path.basename(level_path))[0]
+    key = hashlib.sha1(raw + f"|{size}|{CACHE_VERSION}".encode("utf-8")).hexdigest()[:16]
+    return stem, os.path.join(CACHE_DIR, f"{stem}-{key}.npz")
+
+
+def _read_cache(cache_file):
+    try:
+        with np.load(cache_file) as data:
+            rgb = data["rgb"]
+            return (pygame.surfarray.make_surface(rgb.swapaxes(0, 1)), data["circuit_mask"],
+                    data["on_track"], data["edge_distance"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_cache(cache_file, stem, surf, circuit_mask, on_track, edge_distance):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        rgb = np.transpose(pygame.surfarray.array3d(surf), (1, 0, 2))
+        tmp_path = cache_file + ".tmp.npz"
+        np.savez(tmp_path, rgb=rgb, circuit_mask=circuit_mask, on_track=on_track, edge_distance=edge_distance)
+        os.replace(tmp_path, cache_file)
+        # Stergem versiunile compilate vechi ale aceluiasi nivel
+        for old in glob.glob(os.path.join(CACHE_DIR, f"{stem}-*.npz")):
+            if old != cache_file:
+                os.remove(old)
+    except OSError as e:
+        print(f"Nivelul {stem} nu a putut fi salvat in cache: {e}")
+
+
+def load_level(level_path, size=(800, 480)):
+    """Incarca un nivel din JSON (compilat din cache daca se poate). Necesita pygame.init()."""
+    level_path = os.path.abspath(level_path)
+    with open(level_path, "rb") as f:
+        raw = f.read()
+
+    key = (level_path, raw, tuple(size))
+    if key in _loaded:
+        return _loaded[key]
+
+    spec = json.loads(raw.decode("utf-8"))
+    stem, cache_file = _cache_path(level_path, raw, tuple(size))
+
+    compiled = _read_cache(cache_file) if os.path.exists(cache_file) else None
+    if compiled is None:
+        compiled = compile_level(spec, tuple(size))
+        _write_cache(cache_file, stem, *compiled)
+    surf, circuit_mask, on_track, edge_distance = compiled
+
+    level = Level(
+        name=spec.get("name", stem),
+        surface=surf,
+        circuit_mask=circuit_mask,
+        collision_field=CollisionField.from_arrays(on_track, edge_distance),
+        start=tuple(spec["start"]),
+        finish=tuple(spec["finish"]),
+        track_width=spec.get("track_width", DEFAULT_TRACK_WIDTH),
+    )
+    _loaded[key] = level
+    return level
+
+
+def level_files(levels_dir=LEVELS_DIR):
+    return sorted(glob.glob(os.path.join(levels_dir, "*.json")))
+
+
+def load_levels(levels_dir=LEVELS_DIR, size=(800, 480)):
+    """Toate nivelurile din levels_dir, in ordinea de rotatie; fisierele invalide sunt sarite."""
+    levels = []
+    for path in level_files(levels_dir):
+        try:
+            levels.append(load_level(path, size))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Nivel invalid {os.path.basename(path)}: {e}")
+    return levels
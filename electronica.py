@@ -3,29 +3,32 @@ import numpy as np
 import pygame
 import math
 import random
-import sys
 import os
+import circuit
+import frame_presenter
+import game_clock
 import leaderboard  # NOU: Importul modulului extern
-
-# --- IMPORT SAFE PENTRU AMOGUS ---
-try:
-    import amogus
-except ImportError:
-    print("ATENTIE: 'amogus.py' lipseste.")
-    amogus = None
+import light_tracking
+import quality
+import resources
+import text_cache
 
 # --- CONFIGURARE ---
 WINDOW_SIZE = (800, 480)
-TRACK_WIDTH = 50
 # Calea fișierului pentru clasament este acum CSV
 LEADERBOARD_GAME_FILE = "electronica.csv"
+# Miscarea lipiturii si temporizarile merg cu SIM_HZ pasi pe secunda, oricare ar fi FPS-ul randarii
+SIM_HZ = 60
+RENDER_FPS = int(os.environ.get("RENDER_FPS", "60"))
+PLAYER_FOLLOW = 0.2  # cat din distanta pana la lumina recupereaza lipitura pe fiecare pas
+TARGET_SMOOTHING = 0.5  # cat din noua pozitie a luminii intra in tinta pe fiecare pas
+FAIL_STEPS = 120  # pasi de la scurtcircuit pana la reparatie (primii 60 cu shake)
 
 # Culori
 BLACK = (20, 20, 20)
-GREEN_TRACE = (0, 200, 0)
-PAD_COLOR = (192, 192, 192)
 SOLDER_COLOR = (255, 255, 200)
 FAIL_COLOR = (255, 50, 50)
+WARNING_COLOR = (255, 140, 0)  # lipitura aproape de marginea firului
 TRACKER_OUTLINE_COLOR = (0, 255, 255)  # Cyan
 COLOR_HIGHSCORE = (0, 255, 255)  # Cyan neon
 COLOR_INPUT_BG = (50, 50, 50)
@@ -36,14 +39,47 @@ sensitivity = 240
 lower_color = np.array([0, 0, sensitivity])
 upper_color = np.array([180, 60, 255])
 
-# Variabile Tracking
-last_cx = 320
-last_cy = 240
-has_lock = False
+# Variabile Tracking (lock-ul si ultima pozitie sunt tinute de light_tracking.BlobTracker)
 SEARCH_RADIUS = 150
 
-# START ZONE CONSTANT
-START_ZONE_RADIUS = TRACK_WIDTH // 2 + 5
+# NIVELURI: placile vin din levels/*.json (vezi circuit.py); cu rotatia pornita fiecare runda
+# noua (restart sau intrare din harta) trece la urmatoarea placa
+LEVEL_ROTATION = os.environ.get("LEVEL_ROTATION", "1") != "0"
+level_index = 0
+
+# Sub atatia pixeli pana la marginea firului avertizam jucatorul (inainte de scurtcircuit)
+NEAR_EDGE_DISTANCE = 8
+
+# Morfologie pe masca de lumina (kernel 3x3): fiecare iteratie "vede" 1 pixel mai departe,
+# deci un crop largit cu MORPH_MARGIN da exact acelasi rezultat ca procesarea pe tot frame-ul
+MORPH_ITERATIONS = 2
+MORPH_MARGIN = 2 * MORPH_ITERATIONS
+
+# NIVELURI DE CALITATE (inlocuiesc vechiul electronica.bk.py): de la cel mai frumos la cel mai usor.
+# - circuit_mask: in PLAY cautam lumina doar pe circuit ("fog of war"), altfel pe tot frame-ul
+# - play_indicator: cercul de tracking desenat peste placa in PLAY
+# - detection_scale: detectia pe frame-ul micsorat (0.5 = jumatate, 0.25 = sfert); centrele se
+#   scaleaza inapoi la rezolutia camerei
+# - morph_iterations: erode/dilate pe masca de detectie
+QUALITY_TIERS = [
+    {"name": "full", "circuit_mask": True, "play_indicator": True, "detection_scale": 1.0, "morph_iterations": 2},
+    {"name": "balanced", "circuit_mask": True, "play_indicator": True, "detection_scale": 0.5,
+     "morph_iterations": 1},
+    # Ca fostul electronica.bk.py fara masca de circuit si fara indicator in PLAY, dar detectia e
+    # la jumatate de rezolutie (max pooling) cu o iteratie de morfologie, nu la rezolutie completa cu 2
+    {"name": "light", "circuit_mask": False, "play_indicator": False, "detection_scale": 0.5,
+     "morph_iterations": 1},
+    {"name": "minimal", "circuit_mask": False, "play_indicator": False, "detection_scale": 0.25,
+     "morph_iterations": 0},
+]
+# Tier-ul de pornire; cu QUALITY_AUTO jocul coboara/urca singur dupa timpul masurat pe frame
+QUALITY_TIER = os.environ.get("QUALITY_TIER", "balanced")
+QUALITY_AUTO = os.environ.get("QUALITY_AUTO", "1") != "0"
+FRAME_BUDGET_MS = 1000 / RENDER_FPS
+
+# Dupa detectia micsorata rafinam centrul la rezolutie completa, doar in jurul detectiei
+DETECTION_REFINE = os.environ.get("DETECTION_REFINE", "1") != "0"
+REFINE_RADIUS = 24  # px in camera, in jurul detectiei grosiere
 
 
 # --- FUNCTII VECHI DE LEADERBOARD AU FOST ELIMINATE ---
@@ -51,71 +87,158 @@ START_ZONE_RADIUS = TRACK_WIDTH // 2 + 5
 
 
 def create_level_surface():
-    surf = pygame.Surface(WINDOW_SIZE)
-    surf.fill(BLACK)
-
-    points = [
-        (50, 240), (150, 240), (200, 100), (350, 100),
-        (400, 380), (550, 380), (600, 240), (750, 240)
-    ]
+    """Placa implicita (levels/01_placa_de_baza.json): (suprafata, start, final)."""
+    level = circuit.load_level(os.path.join(circuit.LEVELS_DIR, circuit.DEFAULT_LEVEL), WINDOW_SIZE)
+    return level.surface, level.start, level.finish
+
+
+def next_level(levels):
+    """Nivelul pentru runda urmatoare (acelasi mereu daca LEVEL_ROTATION e oprit)."""
+    global level_index
+    level = levels[level_index % len(levels)]
+    if LEVEL_ROTATION:
+        level_index += 1
+    return level
+
+
+def quality_tier_index(name):
+    for i, tier in enumerate(QUALITY_TIERS):
+        if tier["name"] == name:
+            return i
+    print(f"Tier de calitate necunoscut '{name}', folosim '{QUALITY_TIERS[0]['name']}'")
+    return 0
+
+
+def detection_size(w, h, scale):
+    """Dimensiunea (w, h) la care facem detectia pentru o imagine w x h."""
+    return max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+
+
+def downscale_for_detection(img, scale, interpolation=cv2.INTER_AREA):
+    if scale == 1.0:
+        return img
+    h, w = img.shape[:2]
+    return cv2.resize(img, detection_size(w, h, scale), interpolation=interpolation)
+
+
+def pool_for_detection(img, scale):
+    """
+    Micsorarea frame-ului pentru detectie cu max pooling pe fiecare canal: un pixel mic are, pe
+    fiecare canal, maximul din zona lui. Cu INTER_AREA media cu fundalul cobora o lumina mica sub
+    pragul V si o pierdeam; asa lumina trece pragul si isi pastreaza aria (in pixeli de camera).
+    """
+    if scale == 1.0:
+        return img
+    h, w = img.shape[:2]
+    k = max(1, int(round(1 / scale)))
+    # anchor (0, 0): pixelul (x, y) ia maximul din [x, x + k), exact blocul citit de INTER_NEAREST
+    pooled = cv2.dilate(img, np.ones((k, k), np.uint8), anchor=(0, 0))
+    return cv2.resize(pooled, detection_size(w, h, scale), interpolation=cv2.INTER_NEAREST)
+
+
+def build_camera_circuit_mask(circuit_mask, cam_w, cam_h, scale=1.0):
+    """
+    Masca circuitului la rezolutia camerei plus zona de procesat (bounding box + MORPH_MARGIN).
+    Returneaza (mask_cam, roi, roi_mask): roi = (x0, y0, x1, y1) sau None daca circuitul e gol,
+    roi_mask = masca decupata pe roi, la rezolutia de detectie (scale).
+    """
+    mask_cam = cv2.resize(circuit_mask, (cam_w, cam_h), interpolation=cv2.INTER_NEAREST)
+    ys, xs = np.nonzero(mask_cam)
+    if len(xs) == 0:
+        return mask_cam, None, None
+
+    x0 = max(0, int(xs.min()) - MORPH_MARGIN)
+    y0 = max(0, int(ys.min()) - MORPH_MARGIN)
+    x1 = min(cam_w, int(xs.max()) + 1 + MORPH_MARGIN)
+    y1 = min(cam_h, int(ys.max()) + 1 + MORPH_MARGIN)
+    roi_mask = downscale_for_detection(mask_cam[y0:y1, x0:x1], scale, interpolation=cv2.INTER_NEAREST)
+    return mask_cam, (x0, y0, x1, y1), roi_mask
 
-    pygame.draw.lines(surf, GREEN_TRACE, False, points, TRACK_WIDTH)
-    for p in points:
-        pygame.draw.circle(surf, GREEN_TRACE, p, TRACK_WIDTH // 2)
 
-    pygame.draw.circle(surf, PAD_COLOR, points[0], TRACK_WIDTH - 5)
-    pygame.draw.circle(surf, PAD_COLOR, points[-1], TRACK_WIDTH - 5)
-
-    font = pygame.font.SysFont('Arial', 20, bold=True)
+def update_color_bounds():
+    global lower_color, upper_color, sensitivity
+    lower_color = np.array([0, 0, sensitivity])
+    upper_color = np.array([180, 100, 255])
 
-    # Scrisul ALB
-    surf.blit(font.render("START", True, (255, 255, 255)), (25, 230))
-    surf.blit(font.render("LED", True, (255, 255, 255)), (730, 230))
 
-    return surf, points[0], points[-1]
+def build_light_mask(hsv, iterations=MORPH_ITERATIONS):
+    """Masca binara cu sursele de lumina dintr-un frame HSV (inRange + erode/dilate)."""
+    mask = cv2.inRange(hsv, lower_color, upper_color)
+    if iterations > 0:
+        mask = cv2.erode(mask, None, iterations=iterations)
+        mask = cv2.dilate(mask, None, iterations=iterations)
+    return mask
 
 
-def create_circuit_mask_opencv(level_surf):
-    """Create OpenCV mask from pygame surface - white where circuit exists"""
-    # Convert pygame surface to numpy array
-    arr = pygame.surfarray.array3d(level_surf)
-    # Transpose to get correct orientation (width, height, channels) -> (height, width, channels)
-    arr = np.transpose(arr, (1, 0, 2))
+def detect_light(frame_bgr, tracker, tier, circuit_roi_mask=None, offset=(0, 0)):
+    """Detectia la rezolutia tier-ului; tracker-ul primeste scala si intoarce coordonate de camera."""
+    small = pool_for_detection(frame_bgr, tier["detection_scale"])
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+    mask = build_light_mask(hsv, tier["morph_iterations"])
+    if circuit_roi_mask is not None:
+        # Apply mask: only keep light detections within circuit area
+        mask = cv2.bitwise_and(mask, mask, mask=circuit_roi_mask)
+    sx = mask.shape[1] / frame_bgr.shape[1]
+    sy = mask.shape[0] / frame_bgr.shape[0]
+    return tracker.update(mask, offset=offset, scale=(sx, sy))
 
-    # Create mask: white (255) where green channel > 50, else black (0)
-    mask = np.where(arr[:, :, 1] > 50, 255, 0).astype(np.uint8)
 
-    return mask
+def refine_blob(frame_bgr, blob, circuit_mask_cam=None):
+    """Centrul luminii la rezolutie completa, cautat doar in fereastra REFINE_RADIUS din jurul blob-ului."""
+    cam_h, cam_w = frame_bgr.shape[:2]
+    x0, y0 = max(0, blob.cx - REFINE_RADIUS), max(0, blob.cy - REFINE_RADIUS)
+    x1, y1 = min(cam_w, blob.cx + REFINE_RADIUS + 1), min(cam_h, blob.cy + REFINE_RADIUS + 1)
+    if x1 <= x0 or y1 <= y0:
+        return blob
 
+    hsv = cv2.cvtColor(frame_bgr[y0:y1, x0:x1], cv2.COLOR_BGR2HSV)
+    mask = build_light_mask(hsv)
+    if circuit_mask_cam is not None:
+        mask = cv2.bitwise_and(mask, mask, mask=circuit_mask_cam[y0:y1, x0:x1])
 
-def update_color_bounds():
-    global lower_color, upper_color, sensitivity
-    lower_color = np.array([0, 0, sensitivity])
-    upper_color = np.array([180, 100, 255])
+    M = cv2.moments(mask, binaryImage=True)
+    if M["m00"] == 0:
+        return blob
+    return blob._replace(cx=x0 + int(M["m10"] / M["m00"]), cy=y0 + int(M["m01"] / M["m00"]))
 
 
 def main():
-    global sensitivity, last_cx, last_cy, has_lock
+    global sensitivity
 
     pygame.init()
     # NOFRAME removes the top bar
     screen = pygame.display.set_mode(WINDOW_SIZE, pygame.NOFRAME)
     pygame.display.set_caption("PCB Solder - Auto Flashlight Mode")
     clock = pygame.time.Clock()
+    sim_clock = game_clock.GameClock(SIM_HZ)
 
     font = pygame.font.SysFont('Arial', 30, bold=True)
     big_font = pygame.font.SysFont('Consolas', 50, bold=True)
     small_font = pygame.font.SysFont('Arial', 20)
     font_leaderboard = pygame.font.SysFont('Consolas', 25, bold=True)
 
-    cap = cv2.VideoCapture(0)
-    # Warmup rapid
-    for _ in range(5): cap.read()
-
-    level_surf, start_pos, end_pos = create_level_surface()
-    circuit_mask = create_circuit_mask_opencv(level_surf)
+    # Camera citita pe thread separat (primul read asteapta singur primul frame);
+    # cand rulam din harta.py e aceeasi camera, deja deschisa, pentru toate jocurile
+    cap = resources.get_camera()
+    # Imaginea de camera din CALIBRATE: un singur Surface refolosit, fara cvtColor/make_surface
+    presenter = frame_presenter.FramePresenter(WINDOW_SIZE, "BGR")
+
+    # Nivelurile vin compilate (suprafata, masca, coliziune) din cache-ul de pe disc
+    levels = circuit.load_levels(size=WINDOW_SIZE)
+    if not levels:
+        print(f"Niciun nivel in {circuit.LEVELS_DIR}")
+        resources.release_camera()
+        resources.close_display()
+        return
+    level = next_level(levels)
+    level_surf, start_pos, end_pos = level.surface, level.start, level.finish
+    start_zone_radius = level.track_width // 2 + 5
+    near_edge = False
+    # Masca la rezolutia camerei, calculata o singura data per nivel si rezolutie
+    circuit_mask_cam_cache = {}
 
     player_pos = list(start_pos)
+    prev_player_pos = list(player_pos)  # pozitia de la pasul anterior, pentru desenare interpolata
     target_pos = list(start_pos)
 
     visual_tracking_pos = None
@@ -133,334 +256,350 @@ def main():
     start_time = 0
 
     # Tracking Variables
-    last_cx, last_cy = 320, 240
-    has_lock = False
+    tracker = light_tracking.BlobTracker(search_radius=SEARCH_RADIUS)
+
+    # Calitatea se adapteaza la cat de repede merge placa (Pi vs laptop)
+    governor = quality.QualityGovernor(QUALITY_TIERS, budget_ms=FRAME_BUDGET_MS,
+                                       start=quality_tier_index(QUALITY_TIER), auto=QUALITY_AUTO)
 
     # Variabilă pentru a preveni re-verificarea scorului în același frame (logica veche)
     score_checked_on_win = False
 
+    # Randam mai des decat vine camera: detectia ruleaza o data pe frame de camera, iar intre
+    # frame-uri noi refolosim ultimul blob (ca la submit-ul din pose/hands)
+    last_frame_seq = 0
+    blob = None
+
+    launch_repair = False  # scurtcircuit -> pornim amogus dupa ce eliberam camera si fereastra
     running = True
-    while running:
-        # --- EVENIMENTE SI INPUT ---
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: running = False
-
-            # INPUT NUME (Dupa WIN)
-            if game_state == "INPUT_NAME":
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_BACKSPACE:
-                        input_name = input_name[:-1]
-                    elif event.key == pygame.K_RETURN:
-                        if len(input_name) == 3:
-                            # PASUL 3: Salvarea scorului prin modulul extern
-                            leaderboard.update_leaderboard(input_name, final_score, LEADERBOARD_GAME_FILE)
-
-                            # PASUL 4: Citirea clasamentului actualizat
-                            current_leaderboard_data = leaderboard.import_highscores(LEADERBOARD_GAME_FILE)
-
-                            game_state = "SHOW_LEADERBOARD"
-
-                    elif len(input_name) < 3:
-                        if event.unicode.isalnum():
-                            input_name += event.unicode.upper()
-
-            # RESTART (Dupa Leaderboard)
-            elif game_state == "SHOW_LEADERBOARD":
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-                    game_state = "CALIBRATE"
-                    player_pos = list(start_pos)
-                    target_pos = list(start_pos)
-                    input_name = ""
-                    has_lock = False
-                    score_checked_on_win = False  # Reset
-
-            # GAME CONTROLS
-            else:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-
-                    if game_state == "CALIBRATE":
-                        if event.key == pygame.K_SPACE:
-                            in_start_zone = False
-                            if visual_tracking_pos:
-                                dist_to_start = math.hypot(visual_tracking_pos[0] - start_pos[0],
-                                                           visual_tracking_pos[1] - start_pos[1])
-                                if dist_to_start < START_ZONE_RADIUS:
-                                    in_start_zone = True
-
-                            if visual_tracking_pos and in_start_zone:
-                                game_state = "PLAY"
-                                player_pos = list(target_pos)
-                                start_time = pygame.time.get_ticks()
-                            elif not visual_tracking_pos:
-                                print("Nu vad lumina!")
-                            elif not in_start_zone:
-                                print("Trebuie sa fii in cercul de START!")
-
-        ret, frame = cap.read()
-        if not ret: break
-
-        frame = cv2.flip(frame, 1)
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        cam_h, cam_w, _ = frame.shape
-
-        keys = pygame.key.get_pressed()
-
-        if game_state == "CALIBRATE":
-            if keys[pygame.K_UP]:
-                sensitivity = min(sensitivity + 1, 255)
-                update_color_bounds()
-            if keys[pygame.K_DOWN]:
-                sensitivity = max(sensitivity - 1, 100)
-                update_color_bounds()
-
-        # --- PROCESARE VIDEO ---
-        mask = cv2.inRange(hsv, lower_color, upper_color)
-        mask = cv2.erode(mask, None, iterations=2)
-        mask = cv2.dilate(mask, None, iterations=2)
-
-        # APPLY CIRCUIT MASK IN PLAY MODE
-        if game_state == "PLAY":
-            # Resize circuit mask to camera resolution
-            circuit_mask_cam = cv2.resize(circuit_mask, (cam_w, cam_h), interpolation=cv2.INTER_NEAREST)
-            # Apply mask: only keep light detections within circuit area
-            mask = cv2.bitwise_and(mask, mask, mask=circuit_mask_cam)
-
-        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-        found_target_this_frame = False
-        current_contour = None
-
-        if cnts:
-            if not has_lock:
-                c = max(cnts, key=cv2.contourArea)
-                if cv2.contourArea(c) > 50:
-                    M = cv2.moments(c)
-                    if M["m00"] != 0:
-                        last_cx = int(M["m10"] / M["m00"])
-                        last_cy = int(M["m01"] / M["m00"])
-                        has_lock = True
-                        found_target_this_frame = True
-                        current_contour = c
-            else:
-                best_contour = None
-                min_dist = SEARCH_RADIUS
-                temp_cx, temp_cy = 0, 0
-
-                for c in cnts:
-                    if cv2.contourArea(c) < 50: continue
-                    M = cv2.moments(c)
-                    if M["m00"] != 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                        dist = math.hypot(cx - last_cx, cy - last_cy)
-                        if dist < min_dist:
-                            min_dist = dist
-                            best_contour = c
-                            temp_cx = cx
-                            temp_cy = cy
-
-                if best_contour is not None:
-                    last_cx = temp_cx
-                    last_cy = temp_cy
-                    found_target_this_frame = True
-                    current_contour = best_contour
-
-        if found_target_this_frame:
-            screen_x = int((last_cx / cam_w) * WINDOW_SIZE[0])
-            screen_y = int((last_cy / cam_h) * WINDOW_SIZE[1])
-            visual_tracking_pos = (screen_x, screen_y)
-            target_pos[0] = target_pos[0] * 0.5 + screen_x * 0.5
-            target_pos[1] = target_pos[1] * 0.5 + screen_y * 0.5
-            if current_contour is not None:
-                visual_tracking_radius = int(math.sqrt(cv2.contourArea(current_contour)) / 2)
-        else:
-            visual_tracking_pos = None
-
-        # --- LOGICA JOC ---
-        shake_offset = [0, 0]
-
-        if game_state == "PLAY":
-            player_pos[0] += (target_pos[0] - player_pos[0]) * 0.2
-            player_pos[1] += (target_pos[1] - player_pos[1]) * 0.2
-
-            px, py = int(player_pos[0]), int(player_pos[1])
-            px = max(0, min(WINDOW_SIZE[0] - 1, px))
-            py = max(0, min(WINDOW_SIZE[1] - 1, py))
-
-            try:
-                col = level_surf.get_at((px, py))
-                if col.g < 50 and col.r < 50 and col.b < 50:
-                    game_state = "FAIL"
-                    fail_timer = 120
-            except:
-                pass
-
-            if math.hypot(px - end_pos[0], py - end_pos[1]) < 30:
-                elapsed_time = (pygame.time.get_ticks() - start_time) / 1000.0
-                time_penalty = int(elapsed_time * 100)
-                final_score = max(100, 10000 - time_penalty)
-
-                # NOU: VERIFICARE SCOR DUPA WIN
-                if not score_checked_on_win:
-                    # PASUL 2: Chemati check_score
-                    if leaderboard.check_score(final_score, LEADERBOARD_GAME_FILE):
-                        game_state = "INPUT_NAME"
+    # Curatenia ruleaza si daca jocul cade cu exceptie (altfel fereastra ramane deschisa peste harta)
+    try:
+        while running:
+            # --- EVENIMENTE SI INPUT ---
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: running = False
+
+                # INPUT NUME (Dupa WIN)
+                if game_state == "INPUT_NAME":
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_BACKSPACE:
+                            input_name = input_name[:-1]
+                        elif event.key == pygame.K_RETURN:
+                            if len(input_name) == 3:
+                                # PASUL 3+4: Salvare in fundal, clasamentul actualizat vine imediat din memorie
+                                current_leaderboard_data = leaderboard.submit_score(input_name, final_score,
+                                                                                    LEADERBOARD_GAME_FILE)
+
+                                game_state = "SHOW_LEADERBOARD"
+
+                        elif len(input_name) < 3:
+                            if event.unicode.isalnum():
+                                input_name += event.unicode.upper()
+
+                # RESTART (Dupa Leaderboard)
+                elif game_state == "SHOW_LEADERBOARD":
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                        game_state = "CALIBRATE"
+                        level = next_level(levels)
+                        level_surf, start_pos, end_pos = level.surface, level.start, level.finish
+                        start_zone_radius = level.track_width // 2 + 5
+                        player_pos = list(start_pos)
+                        prev_player_pos = list(player_pos)
+                        target_pos = list(start_pos)
+                        input_name = ""
+                        tracker.reset()
+                        score_checked_on_win = False  # Reset
+
+                # GAME CONTROLS
+                else:
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            running = False
+
+                        if game_state == "CALIBRATE":
+                            if event.key == pygame.K_SPACE:
+                                in_start_zone = False
+                                if visual_tracking_pos:
+                                    dist_to_start = math.hypot(visual_tracking_pos[0] - start_pos[0],
+                                                               visual_tracking_pos[1] - start_pos[1])
+                                    if dist_to_start < start_zone_radius:
+                                        in_start_zone = True
+
+                                if visual_tracking_pos and in_start_zone:
+                                    game_state = "PLAY"
+                                    player_pos = list(target_pos)
+                                    prev_player_pos = list(player_pos)
+                                    start_time = pygame.time.get_ticks()
+                                elif not visual_tracking_pos:
+                                    print("Nu vad lumina!")
+                                elif not in_start_zone:
+                                    print("Trebuie sa fii in cercul de START!")
+
+            camera_frame, frame_seq, _ = cap.latest()
+            if camera_frame is None: break
+            steps = sim_clock.advance()
+
+            # Masuram doar munca noastra (nu si asteptarea dupa camera sau clock.tick)
+            governor.begin_frame()
+            tier = governor.tier
+
+            new_frame = frame_seq != last_frame_seq
+            if new_frame:
+                last_frame_seq = frame_seq
+                frame = cv2.flip(camera_frame, 1)
+                cam_h, cam_w, _ = frame.shape
+
+            keys = pygame.key.get_pressed()
+
+            if game_state == "CALIBRATE":
+                if keys[pygame.K_UP]:
+                    sensitivity = min(sensitivity + 1, 255)
+                    update_color_bounds()
+                if keys[pygame.K_DOWN]:
+                    sensitivity = max(sensitivity - 1, 100)
+                    update_color_bounds()
+
+            # --- PROCESARE VIDEO (doar pe frame-uri noi de camera) ---
+            if new_frame:
+                refine = DETECTION_REFINE and tier["detection_scale"] != 1.0
+                if game_state == "PLAY" and tier["circuit_mask"]:
+                    # APPLY CIRCUIT MASK IN PLAY MODE: procesam doar dreptunghiul circuitului,
+                    # restul frame-ului ar fi oricum sters de masca
+                    cache_key = (level.name, cam_w, cam_h, tier["detection_scale"])
+                    if cache_key not in circuit_mask_cam_cache:
+                        circuit_mask_cam_cache[cache_key] = build_camera_circuit_mask(level.circuit_mask, cam_w, cam_h,
+                                                                                      tier["detection_scale"])
+                    circuit_mask_cam, roi, circuit_roi_mask = circuit_mask_cam_cache[cache_key]
+
+                    if roi is None:
+                        blob = None
                     else:
-                        # Dacă nu este High Score, citim clasamentul pentru afișare
-                        # PASUL 4 (pentru afișare imediată)
-                        current_leaderboard_data = leaderboard.import_highscores(LEADERBOARD_GAME_FILE)
-                        game_state = "SHOW_LEADERBOARD"
-                    score_checked_on_win = True
-
-
-        elif game_state == "FAIL":
-            fail_timer -= 1
-
-            if fail_timer > 60:
-                shake_offset = [random.randint(-15, 15), random.randint(-15, 15)]
-
-            if fail_timer <= 0:
-                print("Lansare task reparatie...")
-                cap.release()
-                pygame.quit()
-                if amogus: amogus.start_game()
-                sys.exit()
-
-        # --- DESENARE ---
-        screen.fill(BLACK)
-
-        dest_rect = level_surf.get_rect()
-        dest_rect.move_ip(shake_offset)
-        screen.blit(level_surf, dest_rect)
-
-        player_draw = (int(player_pos[0] + shake_offset[0]), int(player_pos[1] + shake_offset[1]))
-        if game_state != "CALIBRATE":
-            pygame.draw.circle(screen, SOLDER_COLOR, player_draw, 15)
-
-        cx, cy = WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2
-
-        # --- ECRAN CALIBRARE ---
-        if game_state == "CALIBRATE":
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_rgb = cv2.resize(frame_rgb, WINDOW_SIZE)
-            surf_cam = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            screen.blit(surf_cam, (0, 0))
-
-            if visual_tracking_pos:
-                dist_to_start = math.hypot(visual_tracking_pos[0] - start_pos[0], visual_tracking_pos[1] - start_pos[1])
-                in_start_zone = dist_to_start < START_ZONE_RADIUS
-            else:
-                in_start_zone = False
-
-            start_ring_color = (0, 255, 0) if in_start_zone else (255, 0, 0)
-            pygame.draw.circle(screen, start_ring_color, start_pos, START_ZONE_RADIUS, 3)
-            pygame.draw.line(screen, start_ring_color, (start_pos[0] - 10, start_pos[1]),
-                             (start_pos[0] + 10, start_pos[1]), 1)
-            pygame.draw.line(screen, start_ring_color, (start_pos[0], start_pos[1] - 10),
-                             (start_pos[0], start_pos[1] + 10), 1)
-
-            pygame.draw.rect(screen, (0, 0, 0), (0, 0, 350, 100))
-            screen.blit(small_font.render(f"Prag Lumina: {sensitivity}", True, (200, 200, 200)), (10, 10))
-
-            if not found_target_this_frame:
-                status_txt = "CAUT LUMINA..."
-                col_status = (255, 0, 0)
-            elif not in_start_zone:
-                status_txt = "POZITIONEAZA LA START"
-                col_status = (255, 100, 0)
+                        x0, y0, x1, y1 = roi
+                        # Offset-ul readuce centrele blob-urilor in coordonatele camerei
+                        blob = detect_light(frame[y0:y1, x0:x1], tracker, tier, circuit_roi_mask, offset=(x0, y0))
+                        if blob and refine:
+                            blob = refine_blob(frame, blob, circuit_mask_cam)
+                else:
+                    blob = detect_light(frame, tracker, tier)
+                    if blob and refine:
+                        blob = refine_blob(frame, blob)
+
+            found_target_this_frame = blob is not None
+
+            if found_target_this_frame:
+                screen_x = int((blob.cx / cam_w) * WINDOW_SIZE[0])
+                screen_y = int((blob.cy / cam_h) * WINDOW_SIZE[1])
+                visual_tracking_pos = (screen_x, screen_y)
+                # Netezirea tintei tine de pasii de simulare, nu de cate frame-uri randam
+                smoothing = game_clock.smoothing(TARGET_SMOOTHING, steps)
+                target_pos[0] += (screen_x - target_pos[0]) * smoothing
+                target_pos[1] += (screen_y - target_pos[1]) * smoothing
+                visual_tracking_radius = int(math.sqrt(blob.area) / 2)
             else:
-                status_txt = "SPACE - START"
-                col_status = (0, 255, 0)
-            screen.blit(font.render(status_txt, True, col_status), (10, 50))
-
-            if visual_tracking_pos:
-                pygame.draw.circle(screen, (0, 255, 0), visual_tracking_pos, visual_tracking_radius + 5, 2)
-
-        # --- ECRAN PLAY - Draw tracking indicator ---
-        elif game_state == "PLAY":
-            if visual_tracking_pos:
-                pygame.draw.circle(screen, (0, 255, 255), visual_tracking_pos, visual_tracking_radius + 5, 2)
-                pygame.draw.circle(screen, (255, 255, 0), visual_tracking_pos, 3)
-
-        # --- ECRAN FAIL ---
-        elif game_state == "FAIL":
-            if fail_timer > 60:
-                txt = big_font.render("SCURTCIRCUIT!", True, (255, 0, 0))
-                screen.blit(txt, (WINDOW_SIZE[0] // 2 - txt.get_width() // 2, WINDOW_SIZE[1] // 2))
+                visual_tracking_pos = None
+
+            # --- LOGICA JOC ---
+            shake_offset = [0, 0]
+
+            if game_state == "PLAY":
+                # Pas fix: coliziunea se verifica pe fiecare pas, deci nu "sarim" peste marginea firului
+                for _ in range(steps):
+                    prev_player_pos = list(player_pos)
+                    player_pos[0] += (target_pos[0] - player_pos[0]) * PLAYER_FOLLOW
+                    player_pos[1] += (target_pos[1] - player_pos[1]) * PLAYER_FOLLOW
+
+                    px, py = int(player_pos[0]), int(player_pos[1])
+                    px = max(0, min(WINDOW_SIZE[0] - 1, px))
+                    py = max(0, min(WINDOW_SIZE[1] - 1, py))
+
+                    if not level.collision_field.is_on_track(px, py):
+                        game_state = "FAIL"
+                        fail_timer = FAIL_STEPS
+                        break
+                    near_edge = level.collision_field.distance_to_edge(px, py) < NEAR_EDGE_DISTANCE
+
+                    if math.hypot(px - end_pos[0], py - end_pos[1]) < 30:
+                        elapsed_time = (pygame.time.get_ticks() - start_time) / 1000.0
+                        time_penalty = int(elapsed_time * 100)
+                        final_score = max(100, 10000 - time_penalty)
+
+                        # NOU: VERIFICARE SCOR DUPA WIN
+                        if not score_checked_on_win:
+                            # PASUL 2: Chemati check_score
+                            if leaderboard.check_score(final_score, LEADERBOARD_GAME_FILE):
+                                game_state = "INPUT_NAME"
+                            else:
+                                # Dacă nu este High Score, citim clasamentul pentru afișare
+                                # PASUL 4 (pentru afișare imediată)
+                                current_leaderboard_data = leaderboard.import_highscores(LEADERBOARD_GAME_FILE)
+                                # Rularea intra doar in istoric
+                                leaderboard.record_score(final_score, LEADERBOARD_GAME_FILE)
+                                game_state = "SHOW_LEADERBOARD"
+                            score_checked_on_win = True
+
+                    if game_state != "PLAY":
+                        break
+
+
+            elif game_state == "FAIL":
+                fail_timer -= steps
+
+                if fail_timer > 60:
+                    shake_offset = [random.randint(-15, 15), random.randint(-15, 15)]
+
+                if fail_timer <= 0:
+                    print("Lansare task reparatie...")
+                    launch_repair = True
+                    break
+
+            # --- DESENARE ---
+            screen.fill(BLACK)
+
+            dest_rect = level_surf.get_rect()
+            dest_rect.move_ip(shake_offset)
+            screen.blit(level_surf, dest_rect)
+
+            if game_state == "PLAY":
+                draw_x = sim_clock.blend(prev_player_pos[0], player_pos[0])
+                draw_y = sim_clock.blend(prev_player_pos[1], player_pos[1])
             else:
-                popup_rect = pygame.Rect(150, 100, 500, 280)
-                pygame.draw.rect(screen, (50, 50, 50), popup_rect)
-                pygame.draw.rect(screen, (255, 255, 255), popup_rect, 4)
-
-                msg1 = font.render("PLACA STRICATA!", True, (255, 50, 50))
-                msg2 = font.render("SE CERE REPARATIE MANUALA", True, (255, 255, 255))
-                msg3 = font.render("SE INCARCA...", True, (0, 255, 0))
-
-                screen.blit(msg1, (popup_rect.centerx - msg1.get_width() // 2, 140))
-                screen.blit(msg2, (popup_rect.centerx - msg2.get_width() // 2, 190))
-                screen.blit(msg3, (popup_rect.centerx - msg3.get_width() // 2, 300))
-
-        # --- ECRAN INPUT NAME ---
-        elif game_state == "INPUT_NAME":
-            overlay = pygame.Surface(WINDOW_SIZE)
-            overlay.set_alpha(240)
-            overlay.fill(BLACK)
-            screen.blit(overlay, (0, 0))
-
-            txt_win = big_font.render("LIPITURA PERFECTA!", True, (0, 255, 0))
-            screen.blit(txt_win, (cx - txt_win.get_width() // 2, 50))
-
-            txt_score = font.render(f"SCOR: {final_score}", True, COLOR_HIGHSCORE)
-            screen.blit(txt_score, (cx - txt_score.get_width() // 2, 120))
-
-            txt_prompt = small_font.render("INTRODUCE INITIALE (3):", True, (255, 255, 255))
-            screen.blit(txt_prompt, (cx - txt_prompt.get_width() // 2, 200))
-
-            input_rect = pygame.Rect(cx - 100, 230, 200, 60)
-            pygame.draw.rect(screen, COLOR_INPUT_BG, input_rect)
-            pygame.draw.rect(screen, COLOR_HIGHSCORE, input_rect, 3)
-
-            txt_input = big_font.render(input_name, True, (255, 255, 0))
-            screen.blit(txt_input, (cx - txt_input.get_width() // 2, 235))
-
-            if len(input_name) == 3:
-                txt_enter = small_font.render("APASA [ENTER] PENTRU A SALVA", True, (0, 255, 0))
-                if (pygame.time.get_ticks() // 500) % 2 == 0:
-                    screen.blit(txt_enter, (cx - txt_enter.get_width() // 2, 310))
-
-        # --- ECRAN SHOW LEADERBOARD ---
-        elif game_state == "SHOW_LEADERBOARD":
-            overlay = pygame.Surface(WINDOW_SIZE)
-            overlay.set_alpha(240)
-            overlay.fill(BLACK)
-            screen.blit(overlay, (0, 0))
-
-            txt_lb = big_font.render("TOP INGINERI", True, COLOR_HIGHSCORE)
-            screen.blit(txt_lb, (cx - txt_lb.get_width() // 2, 40))
-
-            start_y = 130
-            # PASUL 5: Afișarea clasamentului
-            for i, (name, s) in enumerate(current_leaderboard_data):
-                # Afișăm doar primele 5 intrări pentru a se potrivi cu logica veche de afișare
-                if i >= 5: break
-
-                color = COLOR_HIGHSCORE if i == 0 else (255, 255, 255)
-                txt_name = font.render(f"{i + 1}. {name}", True, color)
-                txt_s = font.render(str(s), True, color)
-                screen.blit(txt_name, (cx - 150, start_y + i * 40))
-                screen.blit(txt_s, (cx + 80, start_y + i * 40))
-
-            txt_restart = small_font.render("APASA [SPACE] PENTRU RESTART", True, (200, 200, 200))
-            if (pygame.time.get_ticks() // 700) % 2 == 0:
-                screen.blit(txt_restart, (cx - txt_restart.get_width() // 2, 400))
-
-        pygame.display.flip()
-        clock.tick(60)
-
-    cap.release()
-    pygame.quit()
+                draw_x, draw_y = player_pos
+            player_draw = (int(draw_x + shake_offset[0]), int(draw_y + shake_offset[1]))
+            if game_state != "CALIBRATE":
+                solder_color = WARNING_COLOR if game_state == "PLAY" and near_edge else SOLDER_COLOR
+                pygame.draw.circle(screen, solder_color, player_draw, 15)
+
+            cx, cy = WINDOW_SIZE[0] // 2, WINDOW_SIZE[1] // 2
+
+            # --- ECRAN CALIBRARE ---
+            if game_state == "CALIBRATE":
+                screen.blit(presenter.present(frame), (0, 0))
+
+                if visual_tracking_pos:
+                    dist_to_start = math.hypot(visual_tracking_pos[0] - start_pos[0],
+                                               visual_tracking_pos[1] - start_pos[1])
+                    in_start_zone = dist_to_start < start_zone_radius
+                else:
+                    in_start_zone = False
+
+                start_ring_color = (0, 255, 0) if in_start_zone else (255, 0, 0)
+                pygame.draw.circle(screen, start_ring_color, start_pos, start_zone_radius, 3)
+                pygame.draw.line(screen, start_ring_color, (start_pos[0] - 10, start_pos[1]),
+                                 (start_pos[0] + 10, start_pos[1]), 1)
+                pygame.draw.line(screen, start_ring_color, (start_pos[0], start_pos[1] - 10),
+                                 (start_pos[0], start_pos[1] + 10), 1)
+
+                pygame.draw.rect(screen, (0, 0, 0), (0, 0, 350, 100))
+                screen.blit(text_cache.render(small_font, f"Prag Lumina: {sensitivity}", (200, 200, 200)), (10, 10))
+
+                if not found_target_this_frame:
+                    status_txt = "CAUT LUMINA..."
+                    col_status = (255, 0, 0)
+                elif not in_start_zone:
+                    status_txt = "POZITIONEAZA LA START"
+                    col_status = (255, 100, 0)
+                else:
+                    status_txt = "SPACE - START"
+                    col_status = (0, 255, 0)
+                screen.blit(text_cache.render(font, status_txt, col_status), (10, 50))
+
+                if visual_tracking_pos:
+                    pygame.draw.circle(screen, (0, 255, 0), visual_tracking_pos, visual_tracking_radius + 5, 2)
+
+            # --- ECRAN PLAY - Draw tracking indicator ---
+            elif game_state == "PLAY":
+                if visual_tracking_pos and tier["play_indicator"]:
+                    pygame.draw.circle(screen, (0, 255, 255), visual_tracking_pos, visual_tracking_radius + 5, 2)
+                    pygame.draw.circle(screen, (255, 255, 0), visual_tracking_pos, 3)
+
+            # --- ECRAN FAIL ---
+            elif game_state == "FAIL":
+                if fail_timer > 60:
+                    txt = text_cache.render(big_font, "SCURTCIRCUIT!", (255, 0, 0))
+                    screen.blit(txt, (WINDOW_SIZE[0] // 2 - txt.get_width() // 2, WINDOW_SIZE[1] // 2))
+                else:
+                    popup_rect = pygame.Rect(150, 100, 500, 280)
+                    pygame.draw.rect(screen, (50, 50, 50), popup_rect)
+                    pygame.draw.rect(screen, (255, 255, 255), popup_rect, 4)
+
+                    msg1 = text_cache.render(font, "PLACA STRICATA!", (255, 50, 50))
+                    msg2 = text_cache.render(font, "SE CERE REPARATIE MANUALA", (255, 255, 255))
+                    msg3 = text_cache.render(font, "SE INCARCA...", (0, 255, 0))
+
+                    screen.blit(msg1, (popup_rect.centerx - msg1.get_width() // 2, 140))
+                    screen.blit(msg2, (popup_rect.centerx - msg2.get_width() // 2, 190))
+                    screen.blit(msg3, (popup_rect.centerx - msg3.get_width() // 2, 300))
+
+            # --- ECRAN INPUT NAME ---
+            elif game_state == "INPUT_NAME":
+                overlay = pygame.Surface(WINDOW_SIZE)
+                overlay.set_alpha(240)
+                overlay.fill(BLACK)
+                screen.blit(overlay, (0, 0))
+
+                txt_win = text_cache.render(big_font, "LIPITURA PERFECTA!", (0, 255, 0))
+                screen.blit(txt_win, (cx - txt_win.get_width() // 2, 50))
+
+                txt_score = text_cache.render(font, f"SCOR: {final_score}", COLOR_HIGHSCORE)
+                screen.blit(txt_score, (cx - txt_score.get_width() // 2, 120))
+
+                txt_prompt = text_cache.render(small_font, "INTRODUCE INITIALE (3):", (255, 255, 255))
+                screen.blit(txt_prompt, (cx - txt_prompt.get_width() // 2, 200))
+
+                input_rect = pygame.Rect(cx - 100, 230, 200, 60)
+                pygame.draw.rect(screen, COLOR_INPUT_BG, input_rect)
+                pygame.draw.rect(screen, COLOR_HIGHSCORE, input_rect, 3)
+
+                txt_input = text_cache.render(big_font, input_name, (255, 255, 0))
+                screen.blit(txt_input, (cx - txt_input.get_width() // 2, 235))
+
+                if len(input_name) == 3:
+                    txt_enter = text_cache.render(small_font, "APASA [ENTER] PENTRU A SALVA", (0, 255, 0))
+                    if (pygame.time.get_ticks() // 500) % 2 == 0:
+                        screen.blit(txt_enter, (cx - txt_enter.get_width() // 2, 310))
+
+            # --- ECRAN SHOW LEADERBOARD ---
+            elif game_state == "SHOW_LEADERBOARD":
+                overlay = pygame.Surface(WINDOW_SIZE)
+                overlay.set_alpha(240)
+                overlay.fill(BLACK)
+                screen.blit(overlay, (0, 0))
+
+                txt_lb = text_cache.render(big_font, "TOP INGINERI", COLOR_HIGHSCORE)
+                screen.blit(txt_lb, (cx - txt_lb.get_width() // 2, 40))
+
+                start_y = 130
+                # PASUL 5: Afișarea clasamentului
+                for i, (name, s) in enumerate(current_leaderboard_data):
+                    # Afișăm doar primele 5 intrări pentru a se potrivi cu logica veche de afișare
+                    if i >= 5: break
+
+                    color = COLOR_HIGHSCORE if i == 0 else (255, 255, 255)
+                    txt_name = text_cache.render(font, f"{i + 1}. {name}", color)
+                    txt_s = text_cache.render(font, str(s), color)
+                    screen.blit(txt_name, (cx - 150, start_y + i * 40))
+                    screen.blit(txt_s, (cx + 80, start_y + i * 40))
+
+                txt_restart = text_cache.render(small_font, "APASA [SPACE] PENTRU RESTART", (200, 200, 200))
+                if (pygame.time.get_ticks() // 700) % 2 == 0:
+                    screen.blit(txt_restart, (cx - txt_restart.get_width() // 2, 400))
+
+            pygame.display.flip()
+            governor.end_frame()
+            clock.tick(RENDER_FPS)
+    finally:
+        resources.release_camera()
+        leaderboard.flush()
+        resources.close_display()
+
+    if launch_repair:
+        # Importam amogus (si mediapipe) abia acum, nu la pornirea jocului
+        try:
+            import amogus
+            amogus.start_game()
+        except ImportError:
+            print("ATENTIE: 'amogus.py' lipseste.")
+        # Dupa reparatie ne intoarcem in launcher (sau se termina programul, daca rulam separat)
 
 
 if __name__ == "__main__":
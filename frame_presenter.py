@@ -0,0 +1,56 @@
+import cv2
+import numpy as np
+import pygame
+
+"""
+Afisarea frame-urilor de camera pe ecran fara conversii si alocari in fiecare frame.
+
+Tinem un singur buffer numpy de marimea ferestrei si un Surface pygame construit peste el cu
+pygame.image.frombuffer (aceeasi memorie, nu o copie). present() scrie frame-ul direct in
+buffer (cv2.resize/copyto cu dst=), deci ramane cel mult o copiere pe frame; formatul
+(BGR sau RGB) e al frame-ului, asa ca nu mai facem cvtColor doar pentru afisare.
+
+Pentru fundaluri semi-transparente (amogus peste gri) sau intunecate amestecul cu un gri fix
+se face pe buffer cu cv2.convertScaleAbs (src * a + gri * (1 - a)), nu cu set_alpha: blit-ul
+ramane opac si mult mai rapid.
+
+IMPLEMENTARE:
+    presenter = frame_presenter.FramePresenter((800, 480), "BGR")
+    screen.blit(presenter.present(frame), (0, 0))
+    # fundal transparent 150/255 peste gri (30, 30, 30):
+    presenter = frame_presenter.FramePresenter((800, 480), "BGR", alpha=150, background=30)
+"""
+
+
+class FramePresenter:
+    def __init__(self, size, fmt="BGR", alpha=None, background=0):
+        self.size = tuple(size)
+        self.fmt = fmt
+        w, h = self.size
+        self.buffer = np.zeros((h, w, 3), dtype=np.uint8)
+        # Surface-ul foloseste memoria buffer-ului; orice scriere in buffer apare pe ecran la blit
+        self.surface = pygame.image.frombuffer(self.buffer, self.size, fmt)
+        self._blend = None
+        self.set_blend(alpha, background)
+
+    def set_blend(self, alpha=None, background=0):
+        """alpha None = frame-ul exact; altfel 0..255 peste nivelul de gri background (0 = negru)."""
+        if alpha is None:
+            self._blend = None
+        else:
+            a = alpha / 255.0
+            self._blend = (a, background * (1.0 - a))
+
+    def present(self, frame):
+        """Copiaza (si redimensioneaza daca e nevoie) frame-ul in buffer; returneaza Surface-ul."""
+        src = frame
+        if frame.shape[1::-1] != self.size:
+            cv2.resize(frame, self.size, dst=self.buffer)
+            src = self.buffer
+
+        if self._blend is not None:
+            scale, offset = self._blend
+            cv2.convertScaleAbs(src, dst=self.buffer, alpha=scale, beta=offset)
+        elif src is not self.buffer:
+            np.copyto(self.buffer, src)
+        return self.surface
@@ -0,0 +1,62 @@
+import time
+
+"""
+Simulare cu pas fix, separata de rata de randare.
+
+Jocurile miscau obiectele cu "pixeli pe frame" si numarau frame-uri pentru temporizari, asa
+ca atunci cand Pi-ul scapa frame-uri tot jocul incetinea. GameClock aduna timpul real trecut
+intre frame-uri (acumulator) si spune cati pasi fixi de simulare trebuie rulati acum; restul
+ramas in acumulator (alpha, intre 0 si 1) se foloseste la desenare ca sa interpolam intre
+ultimele doua stari. Viteza jocului si dificultatea raman aceleasi la 20 sau la 60 FPS.
+
+Dupa o blocare lunga (incarcare model, camera) rulam cel mult MAX_STEPS pasi pe frame:
+jocul incetineste putin in loc sa sara inainte sau sa ramana in urma la nesfarsit.
+
+IMPLEMENTARE:
+    sim_clock = game_clock.GameClock(step_hz=30)
+    while running:
+        for _ in range(sim_clock.advance()):
+            simulate()                              # logica scrisa pe "un pas" = 1/30 s
+        y = sim_clock.blend(prev_y, y)              # pozitia de desenat, interpolata
+        clock.tick(RENDER_FPS)
+"""
+
+MAX_STEPS = 5  # pasi de simulare pe frame, cel mult
+
+
+class GameClock:
+    def __init__(self, step_hz, max_steps=MAX_STEPS, time_source=time.perf_counter):
+        self.step_hz = step_hz
+        self.dt = 1.0 / step_hz
+        self.max_steps = max_steps
+        self.time_source = time_source
+        self.reset()
+
+    def reset(self):
+        """Uita timpul acumulat (de exemplu dupa o pauza); urmatorul advance() porneste de la zero."""
+        self._last = None
+        self._accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self):
+        """Returneaza cati pasi fixi de simulare au trecut de la apelul anterior."""
+        now = self.time_source()
+        if self._last is None:
+            self._last = now
+        elapsed = now - self._last
+        self._last = now
+
+        self._accumulator += min(elapsed, self.max_steps * self.dt)
+        steps = int(self._accumulator / self.dt)
+        self._accumulator -= steps * self.dt
+        self.alpha = self._accumulator / self.dt
+        return steps
+
+    def blend(self, previous, current):
+        """Valoarea de desenat intre starea de la pasul anterior si cea curenta."""
+        return previous + (current - previous) * self.alpha
+
+
+def smoothing(factor, steps):
+    """Factorul de lerp echivalent cu aplicarea `factor` pe fiecare din cei `steps` pasi."""
+    return 1.0 - (1.0 - factor) ** steps
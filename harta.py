@@ -1,26 +1,10 @@
 import tkinter as tk
 from PIL import Image, ImageTk, ImageDraw
+import importlib
 import os
 import sys
 
-# --- IMPORT GAMES AS MODULES ---
-try:
-    import electronica
-except ImportError:
-    print("Warning: electronica.py not found.")
-    electronica = None
-
-try:
-    import calculatoare_joc
-except ImportError:
-    print("Warning: calculatoare_joc.py not found.")
-    calculatoare_joc = None
-
-try:
-    import automatica
-except ImportError:
-    print("Warning: automatica.py not found.")
-    automatica = None
+import asset_cache
 
 
 class JourneyApp(tk.Tk):
@@ -57,15 +41,18 @@ class JourneyApp(tk.Tk):
             "Corp_J.jpg",
         ]
 
+        # Games are imported only when selected (they pull in cv2/mediapipe and open the camera)
         self.game_map = {
-            "Corp y.jpg": electronica,
-            "Corp_g.jpg": calculatoare_joc,
-            "Corp_J.jpg": automatica
+            "Corp y.jpg": "electronica",
+            "Corp_g.jpg": "calculatoare_joc",
+            "Corp_J.jpg": "automatica"
         }
+        # Shared camera/models (resources.py), imported when the first game starts
+        self.resources = None
 
         self.current_index = 0
         self.images_cache = {}
-        self.button_images = {}  # To keep references to transparent button images
+        self.button_images = {}  # One PhotoImage per button style (size, color, alpha), rendered once
 
         # --- UI Setup ---
         self.canvas = tk.Canvas(self, width=800, height=480, highlightthickness=0, bg="#111111")
@@ -73,6 +60,9 @@ class JourneyApp(tk.Tk):
 
         # LOAD IMAGES WITH ZOOM
         self.load_images()
+
+        # All canvas items are created once; navigation only swaps images and hides/shows groups
+        self.build_layers()
         self.show_main_menu()
 
     def find_file(self, filename):
@@ -99,9 +89,8 @@ class JourneyApp(tk.Tk):
 
             if found_path:
                 try:
-                    img = Image.open(found_path)
-                    img = img.resize((scaled_w, scaled_h), Image.Resampling.LANCZOS)
-                    img = img.crop((0, 0, target_w, target_h))
+                    # Resized & cropped result is cached on disk (rebuilt when the source changes)
+                    img = asset_cache.load_resized(found_path, (scaled_w, scaled_h), (0, 0, target_w, target_h))
 
                     self.images_cache[name] = ImageTk.PhotoImage(img)
                     print(f"Loaded & Cropped: {name}")
@@ -112,16 +101,17 @@ class JourneyApp(tk.Tk):
                 print(f"MISSING FILE: {name}")
                 self.images_cache[name] = None
 
-    def create_transparent_button(self, x, y, width, height, text, color, command, alpha=180):
-        """
-        Creates a custom button using a semi-transparent image on the canvas.
-        alpha: 0 (invisible) to 255 (opaque). 180 is a good "glass" look.
-        """
+    def get_button_image(self, width, height, color, alpha):
+        """Renders the glass image for a button style once and reuses it afterwards."""
+        key = (width, height, color, alpha)
+        tk_img = self.button_images.get(key)
+        if tk_img is not None:
+            return tk_img
 
         # 1. Create a PIL Image with Alpha Channel (RGBA)
         # Parse hex color (e.g., #39FF14) to RGB tuple
-        color = color.lstrip('#')
-        rgb = tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+        hex_color = color.lstrip('#')
+        rgb = tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
 
         # Create rectangle image
         img = Image.new('RGBA', (width, height), (*rgb, alpha))
@@ -130,19 +120,26 @@ class JourneyApp(tk.Tk):
         draw = ImageDraw.Draw(img)
         draw.rectangle([0, 0, width - 1, height - 1], outline=(255, 255, 255, 200), width=2)
 
-        # Convert to PhotoImage
+        # Convert to PhotoImage and keep the reference so it doesn't get garbage collected
         tk_img = ImageTk.PhotoImage(img)
+        self.button_images[key] = tk_img
+        return tk_img
 
-        # Store reference so it doesn't get garbage collected
-        btn_id_str = f"btn_{x}_{y}_{text}"
-        self.button_images[btn_id_str] = tk_img
+    def create_transparent_button(self, x, y, width, height, text, color, command, alpha=180, group="ui_controls"):
+        """
+        Creates a custom button using a semi-transparent image on the canvas.
+        alpha: 0 (invisible) to 255 (opaque). 180 is a good "glass" look.
+        group: canvas tag used to show/hide the button together with its screen.
+        """
+
+        tk_img = self.get_button_image(width, height, color, alpha)
 
         # 2. Draw Image on Canvas
-        img_item = self.canvas.create_image(x, y, image=tk_img, anchor="center", tags="ui_controls")
+        img_item = self.canvas.create_image(x, y, image=tk_img, anchor="center", tags=("ui_controls", group))
 
         # 3. Draw Text on top
         text_item = self.canvas.create_text(x, y, text=text, font=("Courier", 18, "bold"), fill="white",
-                                            tags="ui_controls")
+                                            tags=("ui_controls", group))
 
         # 4. Bind Click Events to both Image and Text
         def on_click(event):
@@ -155,7 +152,7 @@ class JourneyApp(tk.Tk):
         return img_item, text_item
 
     def draw_neon_border(self):
-        self.canvas.delete("neon_border")
+        # Drawn once in build_layers; background changes only swap the image below it
         w, h = 800, 480
 
         colors = ["#4B0082", "#9D00FF", "#FF00FF", "#FFFFFF"]
@@ -169,27 +166,15 @@ class JourneyApp(tk.Tk):
                 tags="neon_border"
             )
 
-    def set_background(self, image_name):
-        self.canvas.delete("bg")
-        self.canvas.delete("error_text")
-
-        img = self.images_cache.get(image_name)
-
-        if img:
-            self.canvas.create_image(0, 0, image=img, anchor="nw", tags="bg")
-        else:
-            self.canvas.create_rectangle(0, 0, 800, 480, fill="#220022", tags="bg")
-            self.canvas.create_text(400, 240, text=f"MISSING:\n{image_name}",
-                                    fill="red", font=("Arial", 30), tags="error_text")
-
-        self.canvas.tag_lower("bg")
+    def build_layers(self):
+        """Creates every canvas item once, bottom to top: background, error text, border, buttons."""
+        self.bg_item = self.canvas.create_image(0, 0, anchor="nw", tags="bg")
+        self.error_bg_item = self.canvas.create_rectangle(0, 0, 800, 480, fill="#220022",
+                                                          state="hidden", tags="error_text")
+        self.error_text_item = self.canvas.create_text(400, 240, text="", fill="red", font=("Arial", 30),
+                                                       state="hidden", tags="error_text")
         self.draw_neon_border()
 
-    def show_main_menu(self):
-        self.set_background(self.main_menu_image_name)
-        self.canvas.delete("ui_controls")
-        self.button_images.clear()  # Clear old button references
-
         # Start Button (Green Glass)
         self.create_transparent_button(
             x=400, y=400,
@@ -197,19 +182,10 @@ class JourneyApp(tk.Tk):
             text="START JOURNEY",
             color="#39FF14",
             command=self.start_journey,
-            alpha=120  # Semi-transparent
+            alpha=120,  # Semi-transparent
+            group="menu_controls"
         )
 
-    def start_journey(self):
-        self.current_index = 0
-        self.update_journey_view()
-
-    def update_journey_view(self):
-        current_image = self.journey_image_names[self.current_index]
-        self.set_background(current_image)
-        self.canvas.delete("ui_controls")
-        self.button_images.clear()
-
         # Navigation Buttons (Cyan Glass)
         # Prev Button
         self.create_transparent_button(
@@ -218,7 +194,8 @@ class JourneyApp(tk.Tk):
             text="<",
             color="#00FFFF",
             command=self.prev_image,
-            alpha=100
+            alpha=100,
+            group="journey_controls"
         )
 
         # Next Button
@@ -228,7 +205,8 @@ class JourneyApp(tk.Tk):
             text=">",
             color="#00FFFF",
             command=self.next_image,
-            alpha=100
+            alpha=100,
+            group="journey_controls"
         )
 
         # Select Button (Magenta Glass)
@@ -238,24 +216,84 @@ class JourneyApp(tk.Tk):
             text="ENTER BUILDING",
             color="#FF00FF",
             command=self.select_building_action,
-            alpha=140
+            alpha=140,
+            group="journey_controls"
         )
 
+    def set_background(self, image_name):
+        img = self.images_cache.get(image_name)
+
+        if img:
+            self.canvas.itemconfigure(self.bg_item, image=img, state="normal")
+            self.canvas.itemconfigure("error_text", state="hidden")
+        else:
+            self.canvas.itemconfigure(self.bg_item, state="hidden")
+            self.canvas.itemconfigure(self.error_text_item, text=f"MISSING:\n{image_name}")
+            self.canvas.itemconfigure("error_text", state="normal")
+
+    def show_controls(self, group):
+        for name in ("menu_controls", "journey_controls"):
+            self.canvas.itemconfigure(name, state="normal" if name == group else "hidden")
+
+    def show_main_menu(self):
+        self.set_background(self.main_menu_image_name)
+        self.show_controls("menu_controls")
+
+    def start_journey(self):
+        self.current_index = 0
+        self.update_journey_view()
+
+    def update_journey_view(self):
+        current_image = self.journey_image_names[self.current_index]
+        self.set_background(current_image)
+        self.show_controls("journey_controls")
+
+    def load_game(self, module_name):
+        try:
+            return importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"Warning: {module_name}.py could not be loaded ({e}).")
+            return None
+
     def select_building_action(self):
         current_building = self.journey_image_names[self.current_index]
         if current_building in self.game_map:
-            game_module = self.game_map[current_building]
+            game_module = self.load_game(self.game_map[current_building])
             if game_module:
-                self.destroy()
-                if hasattr(game_module, 'main'):
-                    game_module.main()
-                elif hasattr(game_module, 'run_game'):
-                    game_module.run_game()
+                self.run_game(game_module)
             else:
                 print("Game module not loaded.")
         else:
             print("No game assigned.")
 
+    def run_game(self, game_module):
+        """Runs a game as a scene in this process, then comes back to the building view."""
+        # Long-lived host: camera and MediaPipe graphs stay open between games (see resources.py).
+        # Imported here, not at startup, so the map doesn't load camera/cv2 before a game is chosen
+        if self.resources is None:
+            import resources
+            resources.hosted = True
+            self.resources = resources
+
+        # The map stays alive (hidden) so returning to it costs nothing
+        self.withdraw()
+        self.update()
+        try:
+            if hasattr(game_module, 'main'):
+                game_module.main()
+            elif hasattr(game_module, 'run_game'):
+                game_module.run_game()
+        except Exception as e:
+            print(f"Game {game_module.__name__} stopped with an error: {e}")
+            # The camera and models may be left in a bad state; the next game reopens them
+            self.resources.discard_after_crash()
+        finally:
+            # Never leave a pygame window over the map
+            self.resources.close_display()
+            self.deiconify()
+            self.focus_force()
+            self.update_journey_view()
+
     def next_image(self):
         self.current_index = (self.current_index + 1) % len(self.journey_image_names)
         self.update_journey_view()
@@ -265,6 +303,15 @@ class JourneyApp(tk.Tk):
         self.update_journey_view()
 
 
-if __name__ == "__main__":
+def main():
     app = JourneyApp()
-    app.mainloop()
\ No newline at end of file
+    try:
+        app.mainloop()
+    finally:
+        # Nothing to release if no game was started
+        if app.resources is not None:
+            app.resources.shutdown()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import threading
+import time
+import traceback
+from collections import namedtuple
+
+"""
+Rulare MediaPipe (pose/hands) pe un thread separat fata de bucla de randare.
+
+Bucla jocului trimite frame-uri cu submit() si citeste rezultatul cel mai nou cu latest(),
+fara sa astepte niciodata modelul. Workerul proceseaza mereu doar cel mai nou frame primit;
+frame-urile trimise cat timp modelul era ocupat sunt sarite (pipelining latest-frame-wins).
+
+O exceptie din model (MediaPipe, procesare) nu opreste thread-ul: o afisam, publicam "fara
+rezultat" pentru frame-ul respectiv (result = None) si trecem la urmatorul, ca jocul sa nu
+deseneze la nesfarsit ultimele landmark-uri ca si cum tracking-ul ar merge.
+
+IMPLEMENTARE:
+    worker = inference.InferenceWorker(pose.process)
+    worker.submit(frame_rgb, frame_ts)      # frame_ts = momentul capturii (time.monotonic())
+    out = worker.latest()                   # Inference(result, timestamp, seq)
+    if out.result and out.result.pose_landmarks: ...
+    worker.stop()
+"""
+
+# result = ce returneaza modelul, timestamp = momentul capturii frame-ului procesat,
+# seq = cate rezultate au fost publicate pana acum (0 = inca nimic)
+Inference = namedtuple("Inference", ["result", "timestamp", "seq"])
+
+
+class InferenceWorker:
+    def __init__(self, process_fn, name="InferenceWorker"):
+        self.process_fn = process_fn
+
+        self._lock = threading.Lock()
+        self._has_work = threading.Event()
+        self._pending = None  # (frame, timestamp) - doar cel mai nou frame
+        self._latest = Inference(None, 0.0, 0)
+
+        # Statistici
+        self.frames_submitted = 0
+        self.frames_skipped = 0
+        self.frames_failed = 0
+        self.last_latency = 0.0  # secunde de la captura pana la publicarea rezultatului
+
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        while True:
+            self._has_work.wait()
+            with self._lock:
+                if not self._running:
+                    return
+                frame, timestamp = self._pending
+                self._pending = None
+                self._has_work.clear()
+
+            try:
+                result = self.process_fn(frame)
+            except Exception:
+                result = None
+                self.frames_failed += 1
+                # Prima eroare cu tot traceback-ul, apoi doar din 100 in 100 (ar umple consola la 30 FPS)
+                if self.frames_failed == 1:
+                    print(f"{self._thread.name}: eroare la procesarea frame-ului, publicam fara rezultat")
+                    traceback.print_exc()
+                elif self.frames_failed % 100 == 0:
+                    print(f"{self._thread.name}: {self.frames_failed} frame-uri cu eroare")
+
+            with self._lock:
+                self._latest = Inference(result, timestamp, self._latest.seq + 1)
+                self.last_latency = time.monotonic() - timestamp
+
+    def submit(self, frame, timestamp=None):
+        """Trimite un frame spre procesare; nu blocheaza. Frame-ul nu trebuie modificat dupa."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._lock:
+            if self._pending is not None:
+                self.frames_skipped += 1
+            self._pending = (frame, timestamp)
+            self.frames_submitted += 1
+            self._has_work.set()
+
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    def stats(self):
+        with self._lock:
+            return {
+                "submitted": self.frames_submitted,
+                "processed": self._latest.seq,
+                "skipped": self.frames_skipped,
+                "failed": self.frames_failed,
+                "latency_ms": self.last_latency * 1000.0,
+            }
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._has_work.set()
+        self._thread.join(timeout=1.0)
@@ -1,5 +1,12 @@
+import atexit
+import bisect
 import csv
 import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
 
 """
 fisierele csv vor avea denumirea jocului urmata de extensia .csv (ex: amongus_wiring.csv)
@@ -11,17 +18,33 @@ IMPLEMENTARE:
     3. chemati functia update_leaderboard, pasând noul nume si scor
     4. chemati functia import_highscores (returneaza o lista cu liste (numele, highscore) sortate crescator)
     5. afisati datele
-"""
 
+Functiile de mai sus folosesc un LeaderboardStore per fisier: top-ul sortat sta in memorie si
+se reciteste din CSV doar cand se schimba mtime-ul fisierului. Scrierea se face intr-un fisier
+temporar urmat de os.replace, ca o cadere de curent sa nu lase CSV-ul pe jumatate scris.
 
-def export_highscores(highscores: list[list], file_path: str) -> None:
-    with open(file_path, mode="w", newline="", encoding="utf-8") as file:
-        writer = csv.writer(file)
-        writer.writerows(highscores)
-    print("CSV file updated successfully.")
+BACKEND SQLITE (LEADERBOARD_BACKEND=sqlite):
+    Toate rularile tuturor jocurilor intra intr-un singur fisier SQLite (LEADERBOARD_DB,
+    implicit leaderboard.db) in mod WAL, fara sa se taie istoricul la 10 randuri. Jocul e
+    numele fisierului CSV fara extensie (electronica.csv -> "electronica"). Functiile de mai
+    sus raman la fel; in plus get_store(file_path) ofera top(n), daily_top(n) si percentile_rank().
+    Ca istoricul sa contina toate rularile, jocurile cheama record_score(scor, fisier) la finalul
+    fiecarei rulari care nu intra in top (fara nume, apare ca ANONYMOUS_NAME); top-ul de 10 e
+    doar un filtru la afisare. Pe backend-ul CSV record_score nu face nimic.
+
+SCRIERE IN FUNDAL (din bucla jocului):
+    Pasii 3 si 4 se pot inlocui cu submit_score(nume, scor, fisier), care returneaza imediat
+    clasamentul actualizat in memorie si lasa scrierea pe card unui thread separat.
+    flush() asteapta scrierile ramase (se cheama si automat la iesirea din program).
+"""
 
+MAX_ENTRIES = 10
+ANONYMOUS_NAME = "---"  # rularile salvate doar pentru istoric (fara initiale)
+BACKEND = os.environ.get("LEADERBOARD_BACKEND", "csv")
+DB_PATH = os.environ.get("LEADERBOARD_DB", "leaderboard.db")
 
-def import_highscores(file_path: str) -> list[list]:
+
+def _read_highscores(file_path: str) -> list[list]:
     # Verificăm dacă fișierul există, altfel returnăm listă goală
     if not os.path.exists(file_path):
         return []
@@ -36,7 +59,7 @@ def import_highscores(file_path: str) -> list[list]:
                     name = row[0]
                     score = int(row[1])
                     highscores.append([name, score])
-                except ValueError:
+                except (ValueError, IndexError):
                     continue  # Sărim peste rândurile corupte
 
         # Sortăm descrescător după scor (index 1)
@@ -44,35 +67,336 @@ def import_highscores(file_path: str) -> list[list]:
         return highscores
 
 
-def check_score(new_score: int, file_path: str) -> bool:
-    highscores = import_highscores(file_path)
+def _write_highscores(highscores: list[list], file_path: str) -> None:
+    # Scriem intr-un fisier temporar din acelasi director, apoi il mutam atomic peste cel vechi
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".leaderboard-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode="w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerows(highscores)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_mtime(file_path: str):
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class LeaderboardStore:
+    """Top-N sortat descrescator, tinut in memorie si invalidat dupa mtime-ul CSV-ului."""
+
+    def __init__(self, file_path: str, max_entries: int = MAX_ENTRIES):
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self._entries = []  # [[nume, scor]], descrescator dupa scor
+        self._keys = []  # -scor pentru fiecare intrare, crescator (pentru bisect)
+        self._mtime = None
+        self._loaded = False
+        self._dirty = False  # Memoria are intrari care inca nu sunt pe disc
+        self._lock = threading.Lock()
+        # Un singur flush odata (writer-ul din fundal si update_leaderboard sincron), altfel
+        # os.replace-ul unui snapshot mai vechi poate ajunge peste unul mai nou
+        self._write_lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        # Cat timp avem modificari nescrise, memoria e sursa de adevar
+        if self._dirty:
+            return
+        mtime = _file_mtime(self.file_path)
+        if self._loaded and mtime == self._mtime:
+            return
+        self._entries = _read_highscores(self.file_path)[:self.max_entries]
+        self._keys = [-score for _, score in self._entries]
+        self._mtime = mtime
+        self._loaded = True
+
+    def highscores(self) -> list[list]:
+        with self._lock:
+            self._refresh()
+            return [list(entry) for entry in self._entries]
+
+    def qualifies(self, new_score: int) -> bool:
+        with self._lock:
+            self._refresh()
+            # Dacă leaderboard-ul nu e plin, orice scor intră; altfel trebuie să bată ultimul
+            if len(self._entries) < self.max_entries:
+                return True
+            return new_score > self._entries[-1][1]
+
+    def insert_deferred(self, name: str, new_score: int) -> list[list]:
+        """Insereaza doar in memorie; scrierea pe disc se face la flush_pending()."""
+        with self._lock:
+            self._refresh()
+            # bisect_right: la scor egal, noul jucător intră după cei existenți (ca la sortarea stabilă)
+            index = bisect.bisect_right(self._keys, -new_score)
+            if index < self.max_entries:
+                self._entries.insert(index, [name, new_score])
+                self._keys.insert(index, -new_score)
+                del self._entries[self.max_entries:]
+                del self._keys[self.max_entries:]
+                self._dirty = True
+            return [list(entry) for entry in self._entries]
+
+    def flush_pending(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = [list(entry) for entry in self._entries]
+
+            # Scrierea e in afara lui _lock: highscores()/qualifies() din bucla jocului nu asteapta discul
+            _write_highscores(snapshot, self.file_path)
+
+            with self._lock:
+                self._mtime = _file_mtime(self.file_path)
+                # Daca intre timp a mai venit o intrare, o scrie urmatorul flush
+                self._dirty = snapshot != self._entries
+        print("CSV file updated successfully.")
+
+    def insert(self, name: str, new_score: int) -> list[list]:
+        highscores = self.insert_deferred(name, new_score)
+        self.flush_pending()
+        return highscores
+
+    def record_run(self, new_score: int) -> None:
+        """CSV-ul tine doar top-ul: rularile care nu intra in el nu se salveaza."""
+
+
+class SqliteLeaderboardStore:
+    """Acelasi API ca LeaderboardStore, dar pastreaza tot istoricul intr-o baza SQLite."""
+
+    def __init__(self, file_path: str, db_path: str = DB_PATH, max_entries: int = MAX_ENTRIES):
+        self.file_path = file_path
+        self.game = os.path.splitext(os.path.basename(file_path))[0]
+        self.max_entries = max_entries
+        self._pending = []  # (nume, scor, created_at) inca nescrise in baza
+        self._lock = threading.Lock()  # conn (citiri) + _pending + _visible_id
+        self._write_lock = threading.Lock()  # write_conn; un singur flush odata
+        # In timpul unui flush, citirile vad doar randurile cu id <= _visible_id: cele noi sunt
+        # inca numarate din _pending pana cand le scoatem de acolo (altfel ar aparea de doua ori)
+        self._visible_id = None
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY,
+                game TEXT NOT NULL,
+                name TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_scores_game_score ON scores (game, score);
+            CREATE INDEX IF NOT EXISTS idx_scores_game_time ON scores (game, created_at);
+        """)
+        self._import_csv_once()
+        # Conexiune separata pentru scrieri: commit-ul nu tine _lock, iar in WAL citirile de pe
+        # self.conn nu asteapta dupa el
+        self.write_conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.write_conn.execute("PRAGMA synchronous=NORMAL")
+
+    def _import_csv_once(self) -> None:
+        # Prima rulare pentru un joc: preluam clasamentul existent din CSV
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM scores WHERE game = ?", (self.game,)).fetchone()
+        if count or not os.path.exists(self.file_path):
+            return
+        created_at = os.path.getmtime(self.file_path)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO scores (game, name, score, created_at) VALUES (?, ?, ?, ?)",
+                [(self.game, name, score, created_at) for name, score in _read_highscores(self.file_path)],
+            )
+
+    def _visible(self) -> tuple[str, tuple]:
+        # Conditia pe id pentru citiri facute in timpul unui flush (apelat cu _lock tinut)
+        if self._visible_id is None:
+            return "", ()
+        return " AND id <= ?", (self._visible_id,)
+
+    def top(self, n: int = MAX_ENTRIES) -> list[list]:
+        with self._lock:
+            visible_sql, visible_args = self._visible()
+            rows = self.conn.execute(
+                "SELECT name, score FROM scores WHERE game = ?" + visible_sql + " ORDER BY score DESC, id LIMIT ?",
+                (self.game, *visible_args, n),
+            ).fetchall()
+            highscores = [[name, score] for name, score in rows]
+            # Scorurile din coada intra dupa cele egale deja salvate (au id mai mare)
+            highscores += [[name, score] for name, score, _ in self._pending]
+        highscores.sort(key=lambda x: x[1], reverse=True)
+        return highscores[:n]
 
-    # 1. Dacă leaderboard-ul nu e plin (< 10), orice scor intră
-    if len(highscores) < 10:
-        return True
+    def daily_top(self, n: int = MAX_ENTRIES, day: float = None) -> list[list]:
+        """Top-ul dintr-o singura zi (ora locala); day = orice timestamp din ziua dorita, implicit azi."""
+        day = time.localtime(time.time() if day is None else day)
+        day_start = time.mktime((day.tm_year, day.tm_mon, day.tm_mday, 0, 0, 0, 0, 0, -1))
+        day_end = time.mktime((day.tm_year, day.tm_mon, day.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        with self._lock:
+            visible_sql, visible_args = self._visible()
+            rows = self.conn.execute(
+                "SELECT name, score FROM scores WHERE game = ? AND created_at >= ? AND created_at < ?" + visible_sql +
+                " ORDER BY score DESC, id LIMIT ?",
+                (self.game, day_start, day_end, *visible_args, n),
+            ).fetchall()
+            highscores = [[name, score] for name, score in rows]
+            highscores += [[name, score] for name, score, created_at in self._pending
+                           if day_start <= created_at < day_end]
+        highscores.sort(key=lambda x: x[1], reverse=True)
+        return highscores[:n]
+
+    def percentile_rank(self, score: int) -> float:
+        """Procentul de rulari ale jocului cu scor strict mai mic (0-100)."""
+        with self._lock:
+            visible_sql, visible_args = self._visible()
+            (total, below) = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(score < ?), 0) FROM scores WHERE game = ?" + visible_sql,
+                (score, self.game, *visible_args),
+            ).fetchone()
+            total += len(self._pending)
+            below += sum(1 for _, pending_score, _ in self._pending if pending_score < score)
+        if not total:
+            return 100.0
+        return below * 100.0 / total
+
+    def highscores(self) -> list[list]:
+        return self.top(self.max_entries)
+
+    def qualifies(self, new_score: int) -> bool:
+        highscores = self.highscores()
+        return len(highscores) < self.max_entries or new_score > highscores[-1][1]
+
+    def insert_deferred(self, name: str, new_score: int) -> list[list]:
+        """Pune scorul in coada (vizibil imediat in top); INSERT-ul se face la flush_pending()."""
+        with self._lock:
+            self._pending.append((name, new_score, time.time()))
+        return self.highscores()
+
+    def record_run(self, new_score: int) -> None:
+        """O rulare fara nume (nu a intrat in top): intra doar in istoric, la flush_pending()."""
+        with self._lock:
+            self._pending.append((ANONYMOUS_NAME, new_score, time.time()))
+
+    def flush_pending(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                pending = list(self._pending)
+                if not pending:
+                    return
+                (self._visible_id,) = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM scores").fetchone()
+
+            # INSERT + commit fara _lock: top()/qualifies() din bucla jocului nu asteapta discul
+            try:
+                with self.write_conn:
+                    self.write_conn.executemany(
+                        "INSERT INTO scores (game, name, score, created_at) VALUES (?, ?, ?, ?)",
+                        [(self.game, name, score, created_at) for name, score, created_at in pending],
+                    )
+            except BaseException:
+                with self._lock:
+                    self._visible_id = None  # raman in coada; le reincearca urmatorul flush
+                raise
+            with self._lock:
+                # Randurile noi devin vizibile in acelasi timp in care ies din coada;
+                # intrarile venite in timpul scrierii raman pentru urmatorul flush
+                del self._pending[:len(pending)]
+                self._visible_id = None
+
+    def insert(self, name: str, new_score: int) -> list[list]:
+        highscores = self.insert_deferred(name, new_score)
+        self.flush_pending()
+        return highscores
+
+
+class BackgroundWriter:
+    """Un singur thread care scrie pe disc, in ordine, joburile primite din bucla jocului."""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, job) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="LeaderboardWriter", daemon=True)
+                self._thread.start()
+        self.jobs.put(job)
+
+    def _run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            try:
+                job()
+            except Exception as e:
+                print(f"Eroare la salvarea clasamentului: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def flush(self) -> None:
+        self.jobs.join()
 
-    # 2. Dacă e plin, verificăm dacă e mai mare decât ultimul (cel mai mic)
-    lowest_score = highscores[-1][1]
-    if new_score > lowest_score:
-        return True
 
-    return False
+_writer = BackgroundWriter()
+_stores = {}
+
+
+def get_store(file_path: str):
+    key = os.path.abspath(file_path)
+    if key not in _stores:
+        if BACKEND == "sqlite":
+            _stores[key] = SqliteLeaderboardStore(file_path)
+        else:
+            _stores[key] = LeaderboardStore(file_path)
+    return _stores[key]
+
+
+def export_highscores(highscores: list[list], file_path: str) -> None:
+    _write_highscores(highscores, file_path)
+    print("CSV file updated successfully.")
+
+
+def import_highscores(file_path: str) -> list[list]:
+    return get_store(file_path).highscores()
+
+
+def check_score(new_score: int, file_path: str) -> bool:
+    return get_store(file_path).qualifies(new_score)
 
 
 def update_leaderboard(name: str, new_score: int, file_path: str) -> None:
     # Nu mai verificăm din nou condițiile aici, presupunem că check_score a dat True
     # sau pur și simplu forțăm inserarea și tăiem surplusul.
+    get_store(file_path).insert(name, new_score)
+
+
+def submit_score(name: str, new_score: int, file_path: str) -> list[list]:
+    """Ca update_leaderboard + import_highscores, dar fara sa astepte scrierea pe disc."""
+    store = get_store(file_path)
+    highscores = store.insert_deferred(name, new_score)
+    _writer.submit(store.flush_pending)
+    return highscores
+
 
-    highscores = import_highscores(file_path)
+def record_score(new_score: int, file_path: str) -> None:
+    """Salveaza in fundal o rulare care nu a intrat in top (pentru istoric si statistici)."""
+    store = get_store(file_path)
+    store.record_run(new_score)
+    _writer.submit(store.flush_pending)
 
-    # Adăugăm noul jucător
-    highscores.append([name, new_score])
 
-    # Sortăm din nou
-    highscores.sort(key=lambda x: x[1], reverse=True)
+def flush() -> None:
+    """Asteapta sa se termine toate scrierile trimise cu submit_score."""
+    _writer.flush()
 
-    # Dacă lista depășește 10 elemente, tăiem coada
-    if len(highscores) > 10:
-        highscores = highscores[:10]  # Păstrăm doar primii 10
 
-    export_highscores(highscores, file_path)
+atexit.register(flush)
@@ -0,0 +1,105 @@
+import math
+from collections import namedtuple
+
+import cv2
+
+"""
+Urmarirea sursei de lumina (lanterna) pe masca binara din electronica.py.
+
+Contururile vin tot din cv2.findContours si pragul MIN_AREA e tot pe cv2.contourArea, ca in
+bucla originala. Ce am scos e cv2.moments (un dict Python pe apel) pe contururile care oricum
+nu pot fi alese: intai filtram pe arie, apoi, cu lock, sarim contururile al caror dreptunghi
+(cv2.boundingRect) e mai departe de ultima pozitie decat SEARCH_RADIUS - centrul unui contur e
+mereu in dreptunghiul lui. Momentele le calculam doar pentru blob-urile ramase.
+- fara lock: cel mai mare blob (arie > MIN_AREA) -> il blocam;
+- cu lock: cel mai apropiat blob (arie >= MIN_AREA) de ultima pozitie, sub SEARCH_RADIUS.
+  Daca nu gasim nimic, lock-ul ramane si asteptam lumina in acelasi loc.
+
+IMPLEMENTARE:
+    tracker = light_tracking.BlobTracker()
+    blob = tracker.update(mask, offset=(x0, y0))    # offset daca masca e un crop din frame
+    blob = tracker.update(small_mask, scale=0.5)    # masca la jumatate din rezolutia camerei
+    if blob:
+        cx, cy, area = blob
+    tracker.reset()                                 # la restart, cautam din nou cel mai mare blob
+"""
+
+SEARCH_RADIUS = 150  # px in camera - cat de departe cautam lumina fata de ultima pozitie
+MIN_AREA = 50  # px^2 de cv2.contourArea in camera - blob-urile mai mici sunt zgomot
+START_POS = (320, 240)
+
+Blob = namedtuple("Blob", ["cx", "cy", "area"])
+
+
+class BlobTracker:
+    def __init__(self, search_radius=SEARCH_RADIUS, min_area=MIN_AREA):
+        self.search_radius = search_radius
+        self.min_area = min_area
+        self.reset()
+
+    def reset(self):
+        self.has_lock = False
+        self.last_cx, self.last_cy = START_POS
+
+    def update(self, mask, offset=(0, 0), scale=1.0):
+        """
+        Cauta lumina in masca; returneaza Blob(cx, cy, area) in coordonate de camera sau None.
+        scale: rezolutia mastii fata de camera (float sau (sx, sy)); centrele si ariile sunt
+        readuse la rezolutia camerei, deci pragurile raman in pixeli de camera.
+        """
+        sx, sy = (scale, scale) if isinstance(scale, (int, float)) else scale
+        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not cnts:
+            return None
+        area_scale = sx * sy
+
+        if not self.has_lock:
+            areas = [cv2.contourArea(c) for c in cnts]
+            best = max(range(len(cnts)), key=areas.__getitem__)
+            area = areas[best] / area_scale
+            if area <= self.min_area:
+                return None
+            self.has_lock = True
+            cx, cy = self._center(cv2.moments(cnts[best]), sx, sy, offset)
+            self.last_cx, self.last_cy = cx, cy
+            return Blob(cx, cy, int(area))
+
+        min_area = self.min_area * area_scale
+        # Ultima pozitie si raza in pixeli de masca; marja acopera rotunjirile la int()
+        lx = (self.last_cx - offset[0] + 0.5) * sx - 0.5
+        ly = (self.last_cy - offset[1] + 0.5) * sy - 0.5
+        reach = self.search_radius * max(sx, sy) + 2
+
+        best = None
+        min_dist = self.search_radius
+        for c in cnts:
+            area = cv2.contourArea(c)
+            if area < min_area:
+                continue
+            x, y, w, h = cv2.boundingRect(c)
+            dx = max(x - lx, lx - (x + w - 1), 0)
+            dy = max(y - ly, ly - (y + h - 1), 0)
+            if dx * dx + dy * dy >= reach * reach:
+                continue
+            m = cv2.moments(c)
+            if m["m00"] == 0:
+                continue  # o linie de pixeli nu are centru
+            cx, cy = self._center(m, sx, sy, offset)
+            dist = math.hypot(cx - self.last_cx, cy - self.last_cy)
+            if dist < min_dist:
+                min_dist = dist
+                best = Blob(cx, cy, int(area / area_scale))
+
+        if best is not None:
+            self.last_cx, self.last_cy = best.cx, best.cy
+        return best
+
+    @staticmethod
+    def _center(m, sx, sy, offset):
+        cx = m["m10"] / m["m00"]
+        cy = m["m01"] / m["m00"]
+        # Centrul pixelului i din masca mica e la (i + 0.5) / scale - 0.5 in camera
+        if sx != 1.0 or sy != 1.0:
+            cx = (cx + 0.5) / sx - 0.5
+            cy = (cy + 0.5) / sy - 0.5
+        return int(cx) + offset[0], int(cy) + offset[1]
@@ -0,0 +1,113 @@
+import numpy as np
+
+import sprites
+
+"""
+Particulele din calculatoare_joc tinute in array-uri NumPy (nu cate un obiect Python fiecare).
+
+ParticlePool are capacitate fixa: pozitiile, vitezele, viata si marimea sunt coloane de
+array-uri, iar particulele vii sunt mereu primele `count` randuri. update() muta, imbatraneste
+si micsoreaza toate particulele dintr-o data; cele moarte sunt inlocuite cu particule vii de
+la coada (swap-remove), deci nu mai avem particles.remove(p) in bucla. La desenare fiecare
+particula e un blit al unui punct pre-randat (sprites.dot), trimise toate intr-un singur
+surface.blits().
+
+Distributiile sunt cele ale vechii clase Particle: viteza uniforma in [-5, 5] pe fiecare axa,
+viata 15..30 frame-uri, raza 2..6 px care scade cu 0.1 pe frame.
+
+IMPLEMENTARE:
+    particles = particle_pool.ParticlePool()
+    particles.emit(x, y, (255, 0, 0), 15)           # explozie de 15 particule
+    particles.update()                              # o data pe frame
+    particles.draw(screen, shake_x, shake_y)
+    particles.clear()                               # la restart
+"""
+
+CAPACITY = 1024  # particulele peste capacitate nu mai sunt emise
+SPEED = 5.0
+LIFE_RANGE = (15, 30)
+SIZE_RANGE = (2, 6)
+SHRINK = 0.1
+
+
+class ParticlePool:
+    def __init__(self, capacity=CAPACITY, rng=None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.uint8)  # index in self.palette
+        self.palette = []
+        self._columns = (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def _color_index(self, color):
+        color = tuple(color)
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def emit(self, x, y, color, count):
+        start = self.count
+        end = min(self.capacity, start + count)
+        n = end - start
+        if n <= 0:
+            return
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-SPEED, SPEED, n)
+        self.vy[start:end] = self.rng.uniform(-SPEED, SPEED, n)
+        self.life[start:end] = self.rng.integers(LIFE_RANGE[0], LIFE_RANGE[1] + 1, n)
+        self.size[start:end] = self.rng.integers(SIZE_RANGE[0], SIZE_RANGE[1] + 1, n)
+        self.color[start:end] = self._color_index(color)
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+        np.maximum(self.size[:n] - SHRINK, 0, out=self.size[:n])
+
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if len(dead) == 0:
+            return
+        # Swap-remove: golurile din primele `alive` randuri se umplu cu particulele vii de la coada
+        alive = n - len(dead)
+        holes = dead[dead < alive]
+        movers = np.flatnonzero(self.life[alive:n] > 0) + alive
+        for column in self._columns:
+            column[holes] = column[movers]
+        self.count = alive
+
+    def draw(self, surface, offset_x=0, offset_y=0):
+        n = self.count
+        if n == 0:
+            return
+
+        # Ca pygame.draw.circle(..., (int(x + offset), int(y + offset)), int(size))
+        xs = (self.x[:n] + offset_x).astype(np.int32).tolist()
+        ys = (self.y[:n] + offset_y).astype(np.int32).tolist()
+        radii = self.size[:n].astype(np.int32).tolist()
+        colors = self.color[:n].tolist()
+
+        blits = []
+        for x, y, r, c in zip(xs, ys, radii, colors):
+            if r >= 1:
+                dot = sprites.dot(self.palette[c], r)
+                blits.append((dot.surface, (x + dot.offset[0], y + dot.offset[1])))
+        surface.blits(blits, doreturn=False)
@@ -0,0 +1,86 @@
+import math
+
+"""
+Filtru predictiv pentru landmark-uri (One-Euro + extrapolare cu viteza constanta).
+
+Lerp-ul simplu urmareste ultima tinta bruta si adauga intarziere peste latenta modelului.
+Aici netezim pozitia cu un filtru One-Euro (putin filtrat cand mana se misca repede, mult
+cand sta pe loc) si estimam viteza; la randare extrapolam pozitia de la momentul capturii
+frame-ului pana la momentul curent, ca mainile sa nu mai "ramana in urma".
+
+IMPLEMENTARE:
+    p = prediction.PointPredictor()
+    p.update((x, y), frame_ts)          # cand vine un rezultat nou de la model
+    x, y = p.predict(time.monotonic())  # in fiecare frame randat
+"""
+
+MIN_CUTOFF = 1.0  # Hz - netezire cand punctul sta pe loc (mai mic = mai smooth)
+BETA = 0.02  # cat de repede scade netezirea cand punctul se misca (px/s)
+D_CUTOFF = 1.0  # Hz - netezirea vitezei
+MAX_LOOKAHEAD = 0.15  # secunde - nu extrapolam mai departe de atat
+RESET_GAP = 0.5  # secunde fara date -> pornim filtrul de la zero
+
+
+def _smoothing_alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroAxis:
+    def __init__(self, min_cutoff=MIN_CUTOFF, beta=BETA, d_cutoff=D_CUTOFF):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = None
+        self.velocity = 0.0
+        self._last_raw = None
+
+    def update(self, raw, dt):
+        if self.value is None or dt <= 0:
+            if self.value is None:
+                self.value = float(raw)
+                self._last_raw = float(raw)
+            return self.value
+
+        raw_velocity = (raw - self._last_raw) / dt
+        self._last_raw = float(raw)
+        a_d = _smoothing_alpha(self.d_cutoff, dt)
+        self.velocity += a_d * (raw_velocity - self.velocity)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.velocity)
+        a = _smoothing_alpha(cutoff, dt)
+        self.value += a * (raw - self.value)
+        return self.value
+
+
+class PointPredictor:
+    def __init__(self, min_cutoff=MIN_CUTOFF, beta=BETA, d_cutoff=D_CUTOFF, max_lookahead=MAX_LOOKAHEAD):
+        self.x = OneEuroAxis(min_cutoff, beta, d_cutoff)
+        self.y = OneEuroAxis(min_cutoff, beta, d_cutoff)
+        self.max_lookahead = max_lookahead
+        self.timestamp = None
+
+    def reset(self):
+        self.x = OneEuroAxis(self.x.min_cutoff, self.x.beta, self.x.d_cutoff)
+        self.y = OneEuroAxis(self.y.min_cutoff, self.y.beta, self.y.d_cutoff)
+        self.timestamp = None
+
+    def update(self, point, timestamp):
+        """Adauga o masuratoare bruta (x, y) facuta la momentul timestamp (secunde)."""
+        if self.timestamp is not None and timestamp - self.timestamp > RESET_GAP:
+            self.reset()
+        dt = 0.0 if self.timestamp is None else timestamp - self.timestamp
+        if dt < 0:
+            return
+        self.x.update(point[0], dt)
+        self.y.update(point[1], dt)
+        self.timestamp = timestamp
+
+    def predict(self, now):
+        """Pozitia estimata la momentul now, ca tuplu de int-uri (x, y)."""
+        if self.timestamp is None:
+            return None
+        lookahead = min(max(now - self.timestamp, 0.0), self.max_lookahead)
+        x = self.x.value + self.x.velocity * lookahead
+        y = self.y.value + self.y.velocity * lookahead
+        return (int(x), int(y))
@@ -0,0 +1,81 @@
+import statistics
+import time
+from collections import deque
+
+"""
+Niveluri de calitate schimbate din mers dupa timpul masurat pe frame.
+
+Jocul isi defineste lista de tier-uri (de la cel mai frumos la cel mai usor); guvernatorul
+masoara cat dureaza munca pe fiecare frame (fara asteptarea din clock.tick) si:
+- coboara un tier cand mediana ultimelor WINDOW frame-uri trece de buget;
+- urca inapoi dupa UPGRADE_AFTER frame-uri linistite (mediana sub UPGRADE_MARGIN * buget);
+  daca tier-ul de sus pica din nou, asteptam de doua ori mai mult inainte sa-l reincercam.
+
+IMPLEMENTARE:
+    governor = quality.QualityGovernor(TIERS, budget_ms=1000 / 60)
+    while running:
+        governor.begin_frame()
+        ... tier = governor.tier ...                # dict-ul tier-ului curent
+        governor.end_frame()                        # inainte de clock.tick()
+"""
+
+WINDOW = 30  # frame-uri pe care facem mediana
+UPGRADE_AFTER = 300  # frame-uri sub buget inainte sa incercam un tier mai bun
+UPGRADE_MARGIN = 0.6  # "sub buget" = mediana sub 60% din buget
+
+
+class QualityGovernor:
+    def __init__(self, tiers, budget_ms=1000 / 60, start=0, auto=True,
+                 window=WINDOW, upgrade_after=UPGRADE_AFTER, upgrade_margin=UPGRADE_MARGIN):
+        self.tiers = tiers
+        self.budget = budget_ms / 1000.0
+        self.index = max(0, min(len(tiers) - 1, start))
+        self.auto = auto
+        self.upgrade_after = upgrade_after
+        self.upgrade_margin = upgrade_margin
+        self._samples = deque(maxlen=window)
+        self._calm_frames = 0
+        self._upgrade_wait = {}  # tier -> cate frame-uri linistite cerem inainte sa revenim la el
+        self._frame_start = None
+
+    @property
+    def tier(self):
+        return self.tiers[self.index]
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Inchide masuratoarea frame-ului curent; returneaza True daca s-a schimbat tier-ul."""
+        if self._frame_start is None:
+            return False
+        work = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        return self.record(work)
+
+    def record(self, work_seconds):
+        self._samples.append(work_seconds)
+        if not self.auto or len(self._samples) < self._samples.maxlen:
+            return False
+
+        median = statistics.median(self._samples)
+        if median > self.budget and self.index < len(self.tiers) - 1:
+            failed = self.index
+            self._upgrade_wait[failed] = self._upgrade_wait.get(failed, self.upgrade_after // 2) * 2
+            return self._switch(self.index + 1)
+
+        if median < self.budget * self.upgrade_margin and self.index > 0:
+            self._calm_frames += 1
+            if self._calm_frames >= self._upgrade_wait.get(self.index - 1, self.upgrade_after):
+                return self._switch(self.index - 1)
+        else:
+            self._calm_frames = 0
+        return False
+
+    def _switch(self, index):
+        previous = self.tier.get("name", self.index)
+        self.index = index
+        self._samples.clear()
+        self._calm_frames = 0
+        print(f"Calitate: {previous} -> {self.tier.get('name', index)}")
+        return True
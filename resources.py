@@ -0,0 +1,121 @@
+import pygame
+
+import camera
+
+"""
+Resurse comune tinute deschise intre jocuri cand totul ruleaza din launcher (harta.py).
+
+Pornite separat (python electronica.py), jocurile se comporta ca inainte: isi deschid camera
+si modelele si le inchid la final. Cand harta.py seteaza resources.hosted = True, camera,
+grafurile MediaPipe si modulele importate raman vii in acelasi proces, iar trecerea
+harta -> joc -> amogus -> harta nu mai reinitializeaza nimic greu.
+
+Setarile de camera pe care un joc le vrea doar pentru el (expunerea din amogus) se fac prin
+set_camera_property(); release_camera() le readuce la valorile de dinainte, ca jocul urmator
+sa primeasca aceeasi camera ca la pornire. Daca thread-ul camerei s-a oprit intre timp,
+get_camera() o redeschide.
+
+IMPLEMENTARE (in joc):
+    cap = resources.get_camera()                        # in loc de camera.ThreadedCamera()
+    resources.set_camera_property(cv2.CAP_PROP_EXPOSURE, 0)  # refacuta la release_camera()
+    hands = resources.get_model("hands", lambda: mp_hands.Hands(...))
+    ...
+    resources.release_model("hands")
+    resources.release_camera()
+    resources.close_display()                           # in loc de pygame.quit()
+
+IMPLEMENTARE (in launcher, cand jocul a cazut cu exceptie):
+    resources.discard_after_crash()
+"""
+
+hosted = False
+
+_camera = None
+_camera_defaults = {}  # prop_id -> valoarea de dinainte de set_camera_property()
+_models = {}
+
+
+def get_camera():
+    global _camera
+    if _camera is not None and not _camera.is_alive():
+        # Thread-ul de citire s-a oprit (sursa s-a terminat); jocul ar primi doar frame-uri vechi
+        _camera.release()
+        _camera = None
+        _camera_defaults.clear()
+    if _camera is None:
+        _camera = camera.ThreadedCamera()
+    return _camera
+
+
+def set_camera_property(prop_id, value):
+    """cap.set() pe camera comuna; valoarea anterioara e refacuta la release_camera()."""
+    cap = get_camera()
+    if prop_id not in _camera_defaults:
+        _camera_defaults[prop_id] = cap.get(prop_id)
+    return cap.set(prop_id, value)
+
+
+def release_camera():
+    """In modul host camera ramane deschisa pentru jocul urmator, cu setarile initiale."""
+    global _camera
+    if _camera is None:
+        return
+    if hosted:
+        _restore_camera_defaults()
+        return
+    _camera.release()
+    _camera = None
+    _camera_defaults.clear()
+
+
+def _restore_camera_defaults():
+    # In ordine inversa: expunerea manuala inainte sa repornim expunerea automata
+    for prop_id, value in reversed(list(_camera_defaults.items())):
+        _camera.set(prop_id, value)
+    _camera_defaults.clear()
+
+
+def get_model(key, factory):
+    """Returneaza modelul cu cheia data, construit o singura data cu factory()."""
+    if key not in _models:
+        _models[key] = factory()
+    return _models[key]
+
+
+def release_model(key):
+    if hosted or key not in _models:
+        return
+    _models.pop(key).close()
+
+
+def close_display():
+    """In modul host inchidem doar fereastra; fonturile si restul pygame raman initializate."""
+    if hosted:
+        pygame.display.quit()
+    else:
+        pygame.quit()
+
+
+def discard_after_crash():
+    """
+    Dupa un joc care a cazut cu exceptie (in launcher): inchidem fereastra lui si eliberam camera
+    si modelele, care pot fi ramase intr-o stare proasta; jocul urmator le deschide din nou.
+    """
+    global _camera
+    for key in list(_models):
+        _models.pop(key).close()
+    if _camera is not None:
+        _restore_camera_defaults()
+        _camera.release()
+        _camera = None
+    close_display()
+
+
+def shutdown():
+    """Elibereaza tot, indiferent de mod (la iesirea din launcher)."""
+    global hosted
+    hosted = False
+    for key in list(_models):
+        release_model(key)
+    release_camera()
+    pygame.quit()
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pygame
+
+"""
+Forme desenate cu pygame.draw pre-randate o singura data in Surface-uri.
+
+Obiectele din jocuri (itemele din calculatoare_joc, conectorii din amogus, particulele)
+se redesenau cu cercuri, linii si dreptunghiuri rotunjite la fiecare frame. Aici le desenam
+o data pe un Surface transparent, decupat la zona desenata, si apoi fiecare obiect e un blit.
+
+Animatiile de puls (raza = int(baza + sin(t * viteza) * amplitudine)) au un numar mic de
+marimi intregi posibile, asa ca PulseSprite pre-randeaza cate un cadru pentru fiecare marime:
+rezultatul pe ecran e identic cu desenarea directa.
+
+Cand toti pixelii desenati sunt opaci (cazul obisnuit: text antialiasat peste o forma plina),
+cadrul devine un Surface fara alpha cu colorkey si RLEACCEL, care se copiaza de ~4 ori mai
+repede decat un blit cu alpha per pixel.
+
+IMPLEMENTARE:
+    def draw_error(surf, center, r):                # center = (x, y) pe Surface-ul cadrului
+        pygame.draw.circle(surf, (255, 50, 50), center, r)
+    error_sprite = sprites.PulseSprite(draw_error, base=30, amplitude=4, speed=0.01)
+    error_sprite.blit(screen, (x, y), pygame.time.get_ticks())
+    sprites.dot((255, 50, 50), 4).blit(screen, (x, y))     # cerc plin, cache pe (culoare, raza)
+    connector = sprites.Sprite(draw_connector, extent=24)   # forma statica, ancorata in centru
+"""
+
+# Cercurile pline (particule, capete de cablu): (culoare, raza) -> Sprite
+_dots = {}
+
+
+class Sprite:
+    """O forma desenata o data; offset = unde e coltul stanga-sus fata de punctul de ancorare."""
+
+    def __init__(self, draw, extent):
+        # Desenam cu ancora in mijlocul unui Surface de 2*extent, apoi pastram doar pixelii desenati
+        canvas = pygame.Surface((2 * extent, 2 * extent), pygame.SRCALPHA)
+        draw(canvas, (extent, extent))
+        rect = canvas.get_bounding_rect()
+        self.surface = _optimize(canvas.subsurface(rect).copy())
+        self.offset = (rect.x - extent, rect.y - extent)
+
+    def blit(self, target, pos):
+        target.blit(self.surface, (pos[0] + self.offset[0], pos[1] + self.offset[1]))
+
+
+class PulseSprite:
+    """Cadrele unui puls int(base + sin(ticks * speed) * amplitude), cate unul pe marime."""
+
+    def __init__(self, draw, base, amplitude, speed, extent=None):
+        self.base = base
+        self.amplitude = amplitude
+        self.speed = speed
+        if extent is None:
+            extent = int(base + amplitude) * 2 + 4
+        self.frames = {}
+        for size in range(int(base - amplitude), int(base + amplitude) + 1):
+            self.frames[size] = Sprite(lambda surf, center, size=size: draw(surf, center, size), extent)
+
+    def size_at(self, ticks):
+        return int(self.base + math.sin(ticks * self.speed) * self.amplitude)
+
+    def blit(self, target, pos, ticks):
+        self.frames[self.size_at(ticks)].blit(target, pos)
+
+
+def _optimize(surface):
+    """Colorkey + RLE daca forma nu are pixeli semi-transparenti, altfel alpha per pixel."""
+    if pygame.display.get_surface() is None:
+        return surface  # fara fereastra nu putem converti la formatul ecranului
+
+    alpha = pygame.surfarray.array_alpha(surface)
+    if np.any((alpha > 0) & (alpha < 255)):
+        return surface.convert_alpha()
+
+    # Cheia trebuie sa fie o culoare care nu apare in forma
+    used = set(map(tuple, pygame.surfarray.array3d(surface)[alpha == 255].reshape(-1, 3)))
+    key = next(c for c in ((255, 0, 255), (0, 255, 1), (1, 2, 3), (3, 2, 1)) if c not in used)
+    opaque = pygame.Surface(surface.get_size()).convert()
+    opaque.fill(key)
+    opaque.blit(surface, (0, 0))
+    opaque.set_colorkey(key, pygame.RLEACCEL)
+    return opaque
+
+
+def dot(color, radius):
+    """Cerc plin, centrat pe pozitia data la blit (ca pygame.draw.circle). radius >= 1."""
+    key = (tuple(color), radius)
+    sprite = _dots.get(key)
+    if sprite is None:
+        sprite = _dots[key] = Sprite(lambda surf, center: pygame.draw.circle(surf, color, center, radius),
+                                     radius + 2)
+    return sprite
@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+import pytest
+
+import electronica
+import light_tracking
+
+"""
+Detectia luminii din electronica pe tier-uri micsorate trebuie sa gaseasca aceleasi lumini mici
+ca tier-ul "full" (rezolutia camerei).
+
+RULARE:
+    python -m pytest -q test_light_detection.py
+"""
+
+FRAMES_PER_RADIUS = 40
+CENTER_TOLERANCE = 3  # px in camera, fara refine_blob
+
+
+def frames_with_light(radius, count, seed=0):
+    """Frame-uri 640x480 cu fundal intunecat zgomotos si o lumina alba (antialiasata) de raza data."""
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        frame = cv2.GaussianBlur(rng.integers(0, 60, (480, 640, 3)).astype(np.uint8), (5, 5), 1)
+        center = (int(rng.integers(40, 600)), int(rng.integers(40, 440)))
+        cv2.circle(frame, center, radius, (255, 255, 255), -1, cv2.LINE_AA)
+        yield frame, center
+
+
+def detected(frame, center, tier):
+    blob = electronica.detect_light(frame, light_tracking.BlobTracker(), tier)
+    return (blob is not None and abs(blob.cx - center[0]) <= CENTER_TOLERANCE
+            and abs(blob.cy - center[1]) <= CENTER_TOLERANCE)
+
+
+def tier(name):
+    return electronica.QUALITY_TIERS[electronica.quality_tier_index(name)]
+
+
+# Tier-ul implicit si "light" (fostul electronica.bk.py, care detecta la rezolutie completa)
+@pytest.mark.parametrize("name", [electronica.QUALITY_TIER, "light"])
+@pytest.mark.parametrize("radius", [5, 6, 7, 8])
+def test_lower_tier_finds_the_same_small_lights_as_full(name, radius):
+    found_full = [detected(f, c, tier("full")) for f, c in frames_with_light(radius, FRAMES_PER_RADIUS)]
+    found = [detected(f, c, tier(name)) for f, c in frames_with_light(radius, FRAMES_PER_RADIUS)]
+    assert all(found_full)
+    assert found == found_full
+
+
+@pytest.mark.parametrize("name", [t["name"] for t in electronica.QUALITY_TIERS])
+def test_every_tier_finds_a_small_light(name):
+    found = [detected(f, c, tier(name)) for f, c in frames_with_light(6, FRAMES_PER_RADIUS, seed=1)]
+    assert all(found)
+
+
+@pytest.mark.parametrize("name", [t["name"] for t in electronica.QUALITY_TIERS])
+def test_noise_is_not_a_light(name):
+    rng = np.random.default_rng(2)
+    frame = cv2.GaussianBlur(rng.integers(0, 60, (480, 640, 3)).astype(np.uint8), (5, 5), 1)
+    # Pixeli izolati saturati (reflexii, pixeli morti) sunt sub MIN_AREA
+    ys, xs = rng.integers(0, 480, 30), rng.integers(0, 640, 30)
+    frame[ys, xs] = 255
+    assert electronica.detect_light(frame, light_tracking.BlobTracker(), tier(name)) is None
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+"""
+Cache pentru textul randat in HUD-urile pygame.
+
+font.render() e unul dintre cele mai scumpe apeluri pe Pi, iar jocurile randau aceleasi
+texte ("PATCH", "RESTANTA", titluri, randuri de clasament) in fiecare frame. render() tine
+suprafetele gata randate intr-un LRU cu cheia (font, text, culoare); textele care se schimba
+des (scor, HP, cronometru) se compun din glife pre-randate cu DigitAtlas, ca sa nu umple LRU-ul
+cu cate o intrare pentru fiecare valoare.
+
+IMPLEMENTARE:
+    surf = text_cache.render(font_ui, "SISTEM CAZUT", (255, 50, 50))    # in loc de font.render
+    timer_digits = text_cache.DigitAtlas(font_timer, WHITE, "s")
+    timer_digits.render_to(screen, f"{time_left:.1f}s", (x, y))
+"""
+
+MAX_ENTRIES = 256
+DIGITS = "0123456789.-+%:x "
+
+_cache = OrderedDict()
+
+
+def render(font, text, color, antialias=True):
+    """Ca font.render(text, antialias, color), dar fiecare combinatie se randeaza o singura data."""
+    key = (font, text, tuple(color), antialias)
+    surf = _cache.get(key)
+    if surf is not None:
+        _cache.move_to_end(key)
+        return surf
+
+    surf = font.render(text, antialias, color)
+    _cache[key] = surf
+    if len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return surf
+
+
+def clear():
+    _cache.clear()
+
+
+class DigitAtlas:
+    """Glifele unui font intr-o culoare, randate o data; textul se compune glifa cu glifa la blit."""
+
+    def __init__(self, font, color, extra_chars="", antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_height()
+        self.glyphs = {}  # caracter -> (surface, avans pe orizontala)
+        for c in set(DIGITS + extra_chars):
+            self._glyph(c)
+
+    def _glyph(self, char):
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            # Avansul din metrics (nu latimea suprafetei), ca spatierea sa fie ca la font.render
+            metrics = self.font.metrics(char)[0]
+            advance = metrics[4] if metrics else self.font.size(char)[0]
+            glyph = self.glyphs[char] = (self.font.render(char, self.antialias, self.color), advance)
+        return glyph
+
+    def size(self, text):
+        return sum(self._glyph(c)[1] for c in text), self.height
+
+    def render_to(self, surface, text, pos):
+        """Deseneaza text cu coltul stanga-sus in pos; returneaza latimea desenata."""
+        x, y = pos
+        for c in text:
+            glyph, advance = self._glyph(c)
+            surface.blit(glyph, (x, y))
+            x += advance
+        return x - pos[0]